@@ -0,0 +1,143 @@
+"""
+Benchmark the API routes and GitHub ingests end to end, offline.
+
+Boots the FastAPI app from main.py against the stand-ins in benchmarks/stand_ins.py:
+an in-memory mongomock database seeded with synthetic portfolio data, and a local
+GitHub GraphQL stub. A full ingest loads --years years of contributions through the
+real ingest path, then incremental ingests and the read routes are measured.
+
+Each route reports sequential p50/p99 latency and throughput with --concurrency
+requests in flight. Requests go through httpx's ASGI transport, so the numbers cover
+the app and its middleware but not a network or server.
+
+  cd backend
+  pip install mongomock
+  python -m benchmarks.api_benchmark [--requests 200] [--concurrency 8] [--years 12] [--cold]
+"""
+import os
+
+# GitHubStatsService reads the token at import; the stub accepts any value
+os.environ.setdefault("GITHUB_TOKEN", "benchmark")
+os.environ.setdefault("ENVIRONMENT", "dev")
+
+from benchmarks.stand_ins import install_github_stand_in, install_mongo_stand_in, seed_portfolio
+from datetime import date, datetime
+from lib.github_stats_service import GitHubStatsService
+from main import app
+from typing import Awaitable, Callable, Dict, List
+from util.cache import service_cache
+import argparse
+import asyncio
+import httpx
+import statistics
+import time
+
+def summarize(timings: List[float]) -> Dict:
+  timings = sorted(timings)
+  return {
+    "p50": statistics.median(timings),
+    "p99": timings[max(0, -(-len(timings) * 99 // 100) - 1)],
+  }
+
+async def time_calls(call: Callable[[], Awaitable], count: int) -> List[float]:
+  timings = []
+  for _ in range(count):
+    started = time.perf_counter()
+    await call()
+    timings.append((time.perf_counter() - started) * 1000)
+  return timings
+
+async def measure_throughput(client: httpx.AsyncClient, path: str, count: int, concurrency: int) -> float:
+  semaphore = asyncio.Semaphore(concurrency)
+
+  async def request():
+    async with semaphore:
+      response = await client.get(path)
+      response.raise_for_status()
+
+  started = time.perf_counter()
+  await asyncio.gather(*(request() for _ in range(count)))
+  return count / (time.perf_counter() - started)
+
+async def benchmark_ingests(years: int, runs: int) -> Dict[str, Dict]:
+  service = GitHubStatsService()
+  from_date = datetime(date.today().year - years + 1, 1, 1)
+  to_date = datetime.combine(date.today(), datetime.min.time())
+
+  async def full_ingest():
+    await service.ingest_contributions(from_date=from_date, to_date=to_date, force_full_load=True)
+
+  async def incremental_ingest():
+    await service.ingest_contributions()
+
+  return {
+    "full ingest": summarize(await time_calls(full_ingest, runs)),
+    "incremental ingest": summarize(await time_calls(incremental_ingest, runs)),
+  }
+
+async def benchmark_routes(requests: int, concurrency: int) -> Dict[str, Dict]:
+  latest_year = str(date.today().year)
+  paths = [
+    "/health",
+    "/me",
+    "/roles",
+    "/projects",
+    "/projects?entity=Self",
+    "/projects/entities",
+    "/contact",
+    "/bootstrap",
+    "/github-stats",
+    f"/github-stats?year={latest_year}",
+    "/github-stats?granularity=week",
+    "/github-stats?stream=ndjson",
+    "/github-stats/analytics",
+  ]
+
+  results = {}
+  transport = httpx.ASGITransport(app=app)
+  async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+    for path in paths:
+      response = await client.get(path)
+      response.raise_for_status()
+
+      async def get():
+        await client.get(path)
+
+      results[path] = {
+        **summarize(await time_calls(get, requests)),
+        "rps": await measure_throughput(client, path, requests, concurrency),
+        "bytes": len(response.content),
+      }
+  return results
+
+async def run(args: argparse.Namespace):
+  mongo = install_mongo_stand_in()
+  seed_portfolio(mongo)
+  queries = install_github_stand_in(args.github_latency_ms)
+
+  ingests = await benchmark_ingests(args.years, args.ingest_runs)
+  print(f"{'ingest':<34}{'p50 ms':>10}{'p99 ms':>10}")
+  for name, result in ingests.items():
+    print(f"{name:<34}{result['p50']:>10.2f}{result['p99']:>10.2f}")
+  print(f"GitHub GraphQL calls: {len(queries)}\n")
+
+  if args.cold:
+    # Expire service cache entries immediately so every request reads the database
+    service_cache.ttl = 0
+  routes = await benchmark_routes(args.requests, args.concurrency)
+  print(f"{'route':<34}{'p50 ms':>10}{'p99 ms':>10}{'req/s':>10}{'bytes':>10}")
+  for path, result in routes.items():
+    print(f"{path:<34}{result['p50']:>10.2f}{result['p99']:>10.2f}{result['rps']:>10.0f}{result['bytes']:>10}")
+
+def main():
+  parser = argparse.ArgumentParser(description="Offline API and ingest benchmark")
+  parser.add_argument("--requests", type=int, default=200, help="requests per route")
+  parser.add_argument("--concurrency", type=int, default=8, help="requests in flight for the throughput run")
+  parser.add_argument("--years", type=int, default=12, help="years of contributions to ingest")
+  parser.add_argument("--ingest-runs", type=int, default=5, help="full and incremental ingests to time")
+  parser.add_argument("--github-latency-ms", type=float, default=0.0, help="simulated GitHub round trip")
+  parser.add_argument("--cold", action="store_true", help="bypass the service cache")
+  asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+  main()
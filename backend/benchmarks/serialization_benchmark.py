@@ -0,0 +1,103 @@
+"""
+Compare the validated and trusted response paths on the largest payloads.
+
+"validated" builds the response model and lets FastAPI validate it again through
+response_model before encoding with the stdlib JSON encoder (the previous behavior).
+"trusted" uses util.http.trusted_response (model_construct + orjson).
+
+Runs offline without MongoDB:
+
+  cd backend
+  python -m benchmarks.serialization_benchmark
+"""
+from datetime import date, timedelta
+from fastapi import FastAPI, Response
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from items.github_stats import GitHubStatsResponse
+from items.projects import ProjectResponse
+from util.http import trusted_response
+import statistics
+import time
+
+ITERATIONS = 200
+
+def build_github_stats(years: int = 12) -> dict:
+  start = date(date.today().year - years + 1, 1, 1)
+  days = (date.today() - start).days + 1
+  contributions = [
+    {"date": (start + timedelta(days=offset)).isoformat(), "count": (offset * 7) % 11}
+    for offset in range(days)
+  ]
+  return {
+    "contributions": contributions,
+    "totalContributions": sum(item["count"] for item in contributions),
+    "lastUpdated": "2026-01-01T00:00:00Z",
+    "username": "jakekohl",
+    "years": [str(start.year + offset) for offset in range(years)],
+  }
+
+def build_projects(count: int = 100) -> list[dict]:
+  return [
+    {
+      "title": f"Project {index}",
+      "entity": ["Self", "Tagboard", "Nurtured Heart"][index % 3],
+      "description": "A long project description. " * 20,
+      "startDate": "2024-01-01",
+      "technologies": ["Python", "FastAPI", "Vue", "MongoDB", "Playwright"],
+      "skillsLeveraged": ["Testing", "Automation", "API Design"],
+      "status": "Completed",
+      "github": "https://github.com/jakekohl/portfolio",
+      "features": [f"Feature {feature}" for feature in range(8)],
+      "dataTest": f"project-{index}",
+      "images": [{"src": f"/assets/{index}/{image}.png", "alt": "Screenshot"} for image in range(4)],
+    }
+    for index in range(count)
+  ]
+
+def build_app(github_stats: dict, projects: list[dict]) -> FastAPI:
+  app = FastAPI()
+
+  @app.get("/validated/github-stats", response_model=GitHubStatsResponse, response_class=JSONResponse)
+  async def validated_github_stats():
+    return GitHubStatsResponse(**github_stats)
+
+  @app.get("/trusted/github-stats", response_model=GitHubStatsResponse)
+  async def trusted_github_stats(response: Response):
+    return trusted_response(GitHubStatsResponse, github_stats, response)
+
+  @app.get("/validated/projects", response_model=list[ProjectResponse], response_class=JSONResponse)
+  async def validated_projects():
+    return projects
+
+  @app.get("/trusted/projects", response_model=list[ProjectResponse])
+  async def trusted_projects(response: Response):
+    return trusted_response(ProjectResponse, projects, response)
+
+  return app
+
+def measure(client: TestClient, path: str) -> dict:
+  client.get(path)
+  timings = []
+  for _ in range(ITERATIONS):
+    started = time.perf_counter()
+    response = client.get(path)
+    timings.append((time.perf_counter() - started) * 1000)
+  timings.sort()
+  return {
+    "p50": statistics.median(timings),
+    "p99": timings[int(len(timings) * 0.99) - 1],
+    "bytes": len(response.content),
+  }
+
+def main():
+  client = TestClient(build_app(build_github_stats(), build_projects()))
+  print(f"{'payload':<14}{'path':<11}{'p50 ms':>9}{'p99 ms':>9}{'bytes':>10}")
+  for payload in ("github-stats", "projects"):
+    results = {mode: measure(client, f"/{mode}/{payload}") for mode in ("validated", "trusted")}
+    for mode, result in results.items():
+      print(f"{payload:<14}{mode:<11}{result['p50']:>9.2f}{result['p99']:>9.2f}{result['bytes']:>10}")
+    print(f"{payload:<14}{'speedup':<11}{results['validated']['p50'] / results['trusted']['p50']:>8.1f}x")
+
+if __name__ == "__main__":
+  main()
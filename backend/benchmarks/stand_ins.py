@@ -0,0 +1,182 @@
+"""
+Local stand-ins for MongoDB and the GitHub GraphQL API, for offline benchmarks.
+
+MongoDB is replaced by an async adapter over mongomock (pip install mongomock),
+installed as util.db's client. GitHub is replaced by an httpx MockTransport that
+answers the viewer and aliased contributionsCollection queries GitHubStatsService
+sends, installed as its shared client. Nothing here is imported by the app.
+"""
+from datetime import date, datetime, timedelta
+from typing import Dict, List
+import asyncio
+import json
+import re
+import httpx
+import lib.github_stats_service
+import util.db
+
+try:
+  import mongomock
+except ImportError:
+  raise SystemExit("The offline benchmarks need mongomock: pip install mongomock")
+
+class StandInCursor:
+  def __init__(self, cursor):
+    self.cursor = cursor
+
+  def sort(self, *args, **kwargs):
+    self.cursor = self.cursor.sort(*args, **kwargs)
+    return self
+
+  def skip(self, count: int):
+    self.cursor = self.cursor.skip(count)
+    return self
+
+  def limit(self, count: int):
+    self.cursor = self.cursor.limit(count)
+    return self
+
+  async def to_list(self, length=None):
+    return list(self.cursor)
+
+  def __aiter__(self):
+    self.iterator = iter(self.cursor)
+    return self
+
+  async def __anext__(self):
+    try:
+      return next(self.iterator)
+    except StopIteration:
+      raise StopAsyncIteration
+
+  async def explain(self):
+    # mongomock has no planner; report the worst case so scan checks stay conservative
+    return {"queryPlanner": {"winningPlan": {"stage": "COLLSCAN"}}}
+
+  async def close(self):
+    pass
+
+class StandInCollection:
+  def __init__(self, collection):
+    self.collection = collection
+    self.name = collection.name
+
+  def find(self, *args, **kwargs):
+    return StandInCursor(self.collection.find(*args, **kwargs))
+
+  def aggregate(self, *args, **kwargs):
+    return StandInCursor(self.collection.aggregate(*args, **kwargs))
+
+  def __getattr__(self, name: str):
+    method = getattr(self.collection, name)
+
+    async def call(*args, **kwargs):
+      return method(*args, **kwargs)
+    return call
+
+class StandInDatabase:
+  def __init__(self, database):
+    self.database = database
+
+  def get_collection(self, name: str) -> StandInCollection:
+    return StandInCollection(self.database.get_collection(name))
+
+  async def command(self, *args, **kwargs):
+    return {"ok": 1.0}
+
+class StandInClient:
+  """The slice of AsyncMongoClient the app uses, backed by an in-memory mongomock client"""
+
+  def __init__(self):
+    self.client = mongomock.MongoClient()
+    self.admin = StandInDatabase(self.client.get_database("admin"))
+
+  def get_database(self, name: str) -> StandInDatabase:
+    return StandInDatabase(self.client.get_database(name))
+
+  async def aconnect(self):
+    pass
+
+  async def close(self):
+    pass
+
+def install_mongo_stand_in() -> StandInClient:
+  client = StandInClient()
+  util.db._client = client
+  return client
+
+def build_calendar(from_value: str, to_value: str) -> Dict:
+  """A deterministic contribution calendar for the requested range, in GitHub's week layout"""
+  day = datetime.fromisoformat(from_value.replace("Z", "")).date()
+  last = datetime.fromisoformat(to_value.replace("Z", "")).date()
+  days = []
+  while day <= last:
+    days.append({"date": day.isoformat(), "contributionCount": (day.toordinal() * 7) % 11})
+    day += timedelta(days=1)
+  return {"contributionCalendar": {"weeks": [{"contributionDays": days[index:index + 7]} for index in range(0, len(days), 7)]}}
+
+def install_github_stand_in(latency_ms: float = 0.0) -> List[str]:
+  """Route GitHub GraphQL calls to a local handler; returns the list of queries it receives"""
+  queries: List[str] = []
+
+  async def handle(request: httpx.Request) -> httpx.Response:
+    if latency_ms:
+      await asyncio.sleep(latency_ms / 1000)
+    body = json.loads(request.content)
+    query, variables = body["query"], body.get("variables") or {}
+    queries.append(query)
+    headers = {"x-ratelimit-remaining": str(5000 - len(queries))}
+    if "viewer" in query:
+      return httpx.Response(200, json={"data": {"viewer": {"login": "benchmark"}}}, headers=headers)
+
+    user = {
+      alias: build_calendar(variables[from_name], variables[to_name])
+      for alias, from_name, to_name in re.findall(r"(\w+): contributionsCollection\(from: \$(\w+), to: \$(\w+)\)", query)
+    }
+    return httpx.Response(200, json={"data": {"user": user}}, headers=headers)
+
+  lib.github_stats_service._github_client = httpx.AsyncClient(transport=httpx.MockTransport(handle))
+  return queries
+
+def seed_portfolio(client: StandInClient, projects: int = 60, roles: int = 12):
+  """Synthetic documents for every collection the read routes serve"""
+  database = client.client.get_database("portfolio")
+  database.me.insert_one({
+    "name": "Benchmark User",
+    "title": "Software Engineer",
+    "avatarUrl": "/assets/avatar.png",
+    "experiences": [{"company": f"Company {index}", "years": index} for index in range(6)],
+    "skills": {"languages": ["Python", "TypeScript"], "frameworks": ["FastAPI", "Vue"], "tools": ["Playwright"]},
+  })
+  database.roles.insert_many([
+    {
+      "title": f"Role {index}",
+      "company": f"Company {index % 5}",
+      "logo": None,
+      "location": "Remote",
+      "startDate": date(2012 + index, 1, 1).isoformat(),
+      "endDate": None if index == roles - 1 else date(2013 + index, 1, 1).isoformat(),
+      "description": ["Built things. " * 10] * 4,
+      "url": "https://example.com",
+      "dataTest": f"role-{index}",
+    }
+    for index in range(roles)
+  ])
+  database.projects.insert_many([
+    {
+      "title": f"Project {index}",
+      "entity": ["Self", "Tagboard", "Nurtured Heart"][index % 3],
+      "description": "A long project description. " * 20,
+      "startDate": "2024-01-01",
+      "technologies": ["Python", "FastAPI", "Vue", "MongoDB", "Playwright"],
+      "skillsLeveraged": ["Testing", "Automation", "API Design"],
+      "status": "Completed",
+      "github": "https://github.com/jakekohl/portfolio",
+      "features": [f"Feature {feature}" for feature in range(8)],
+      "dataTest": f"project-{index}",
+      "images": [{"src": f"/assets/{index}/{image}.png", "alt": "Screenshot"} for image in range(4)],
+    }
+    for index in range(projects)
+  ])
+  database.contact.insert_many([{"type": kind, "value": f"{kind}@example.com"} for kind in ("email", "linkedin", "github")])
+  database.specialties.insert_many([{"name": name} for name in ("Test Automation", "API Design", "CI/CD", "Frontend")])
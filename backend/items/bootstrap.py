@@ -0,0 +1,95 @@
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from pydantic import BaseModel
+from items.contact import ContactResponse
+from items.me import MeResponse, shape_me
+from items.projects import ProjectResponse
+from items.roles import RoleResponse
+from lib.contact_service import ContactService
+from lib.me_service import MeService
+from lib.projects_service import ProjectsService
+from lib.roles_service import RolesService
+from util.http import construct_content, json_response
+from typing import Awaitable, Callable, Dict, List, Optional
+import asyncio
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+router = APIRouter(tags=["bootstrap"])
+
+# A section slower than this is left out so the rest of the page still renders
+BOOTSTRAP_SECTION_TIMEOUT_SECONDS = float(os.getenv("BOOTSTRAP_SECTION_TIMEOUT_SECONDS", "3"))
+
+class BootstrapResponse(BaseModel):
+  me: Optional[MeResponse] = None
+  roles: Optional[List[RoleResponse]] = None
+  entities: Optional[List[str]] = None
+  projects: Optional[List[ProjectResponse]] = None
+  contact: Optional[ContactResponse] = None
+  errors: Dict[str, str] = {}
+
+async def load_me() -> Optional[Dict]:
+  me_data = await MeService().get_me()
+  return shape_me(me_data) if me_data else None
+
+async def load_roles() -> List[Dict]:
+  return construct_content(RoleResponse, await RolesService().get_roles())
+
+async def load_entities() -> List[str]:
+  return await ProjectsService().get_entities()
+
+async def load_projects() -> List[Dict]:
+  return construct_content(ProjectResponse, await ProjectsService().get_projects())
+
+async def load_contact() -> Dict:
+  service = ContactService()
+  contact, specialties = await asyncio.gather(service.get_contact(), service.get_specialties())
+  return construct_content(ContactResponse, dict(contact=contact, specialties=specialties))
+
+SECTIONS: Dict[str, Callable[[], Awaitable]] = {
+  "me": load_me,
+  "roles": load_roles,
+  "entities": load_entities,
+  "projects": load_projects,
+  "contact": load_contact,
+}
+
+async def load_section(name: str, load: Callable[[], Awaitable]):
+  try:
+    return await asyncio.wait_for(load(), BOOTSTRAP_SECTION_TIMEOUT_SECONDS)
+  except asyncio.TimeoutError:
+    raise Exception(f"{name} timed out after {BOOTSTRAP_SECTION_TIMEOUT_SECONDS}s")
+
+@router.get("/bootstrap", response_model=BootstrapResponse)
+async def get_bootstrap(request: Request, response: Response):
+  """Everything the SPA's first paint needs in one round trip
+
+  Runs the /me, /roles, /projects/entities, /projects and /contact reads concurrently.
+  A section that fails or times out is null, with its reason under errors, and the
+  rest are still returned. Degraded payloads are sent with Cache-Control: no-store.
+  """
+  try:
+    results = await asyncio.gather(
+      *(load_section(name, load) for name, load in SECTIONS.items()),
+      return_exceptions=True
+    )
+    payload = {}
+    errors = {}
+    for name, result in zip(SECTIONS, results):
+      if isinstance(result, Exception):
+        print(f"Error loading bootstrap section {name}: {str(result)}")
+        errors[name] = "Section temporarily unavailable"
+        result = None
+      payload[name] = result
+    payload["errors"] = errors
+
+    bootstrap_response = json_response(request, response, BootstrapResponse, payload, "bootstrap")
+    if errors:
+      bootstrap_response.headers["Cache-Control"] = "no-store"
+    return bootstrap_response
+  except Exception as e:
+    raise HTTPException(
+      status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+      detail="Service temporarily unavailable. Please try again later."
+    )
@@ -1,6 +1,8 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, Response, status
 from pydantic import BaseModel
 from lib.contact_service import ContactService
+from util.http import json_response
+import asyncio
 
 router = APIRouter(tags=["contact"])
 
@@ -9,12 +11,14 @@ class ContactResponse(BaseModel):
   specialties: list[dict]
 
 @router.get("/contact", response_model=ContactResponse)
-async def get_contact():
+async def get_contact(request: Request, response: Response):
   try:
-    return ContactResponse(
-      contact=ContactService().get_contact(),
-      specialties=ContactService().get_specialties(),
-    )
+    service = ContactService()
+    contact, specialties = await asyncio.gather(service.get_contact(), service.get_specialties())
+    return json_response(request, response, ContactResponse, dict(
+      contact=contact,
+      specialties=specialties,
+    ), "contact")
   except Exception as e:
     raise HTTPException(
       status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
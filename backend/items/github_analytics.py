@@ -0,0 +1,75 @@
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from pydantic import BaseModel
+from lib.github_stats_service import GitHubStatsService
+from util.http import compute_etag, conditional_response, trusted_response
+from typing import Dict, Optional
+
+router = APIRouter(tags=["github"])
+
+class Streak(BaseModel):
+  length: int
+  start: Optional[str] = None
+  end: Optional[str] = None
+
+class BusiestWeekday(BaseModel):
+  weekday: str
+  total: int
+  average: float
+
+class YearPercentiles(BaseModel):
+  p25: int
+  p50: int
+  p75: int
+  p90: int
+  max: int
+  activeDays: int
+
+class GitHubAnalyticsResponse(BaseModel):
+  fromDate: str
+  toDate: str
+  totalContributions: int
+  activeDays: int
+  longestStreak: Streak
+  currentStreak: Streak
+  rollingAverages: Dict[str, float]
+  busiestWeekday: BusiestWeekday
+  weekdayTotals: Dict[str, int]
+  yearPercentiles: Dict[str, YearPercentiles]
+  computedAt: Optional[str] = None
+  lastUpdated: Optional[str] = None
+
+@router.get("/github-stats/analytics", response_model=GitHubAnalyticsResponse)
+async def get_github_analytics(request: Request, response: Response):
+  """Retrieve contribution analytics computed at ingest time
+
+  Returns the longest and current streaks, 7 and 30-day rolling averages as of the
+  last stored day, weekday totals with the busiest weekday, and per-year percentile
+  thresholds of active days for the heatmap colour scale.
+  """
+  try:
+    service = GitHubStatsService()
+    not_found = HTTPException(
+      status_code=status.HTTP_404_NOT_FOUND,
+      detail="GitHub stats not found. Please ingest data first."
+    )
+
+    metadata = await service.get_ingest_metadata()
+    if not metadata:
+      raise not_found
+
+    etag = compute_etag([metadata.get("lastUpdated"), "analytics"])
+    not_modified = conditional_response(request, response, etag, "github_analytics")
+    if not_modified:
+      return not_modified
+
+    analytics = await service.get_analytics()
+    if not analytics:
+      raise not_found
+    return trusted_response(GitHubAnalyticsResponse, analytics, response)
+  except HTTPException:
+    raise
+  except Exception as e:
+    raise HTTPException(
+      status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+      detail="Service temporarily unavailable. Please try again later."
+    )
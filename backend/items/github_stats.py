@@ -1,8 +1,13 @@
-from fastapi import APIRouter, HTTPException, Header, status, Query
+from fastapi import APIRouter, HTTPException, Header, Request, Response, status, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from lib.github_stats_service import GitHubStatsService
-from typing import Optional, List
-from datetime import datetime
+from lib.github_stats_service import GitHubStatsService, STORAGE_FORMAT
+from lib.ingest_job_service import IngestJobService
+from util.http import compute_etag, conditional_response, get_cache_control, trusted_response
+from util.profiling import PROFILE_HEADER, profiling_authorized
+from typing import Any, AsyncIterator, Dict, Optional, List
+from datetime import date, datetime
+import json
 import os
 from dotenv import load_dotenv
 
@@ -23,41 +28,169 @@ class GitHubStatsResponse(BaseModel):
   username: Optional[str] = None
   year: Optional[str] = None
   years: Optional[List[str]] = None
+  fromDate: Optional[str] = None
+  toDate: Optional[str] = None
+  granularity: Optional[str] = None
+
+class IngestYearResult(BaseModel):
+  year: str
+  created: bool
+  fetchedDays: int
+  fetchedTotal: int
+  storedDays: int
+  storedTotal: int
+  changedDays: Optional[int] = None
 
 class IngestResponse(BaseModel):
   status: str
   contributionsCount: int
   totalContributions: int
   lastUpdated: str
+  changedDays: Optional[int] = None
+  yearsUpdated: List[str] = []
+  years: List[IngestYearResult] = []
+
+class IngestJobResponse(BaseModel):
+  jobId: str
+  status: str
+  createdAt: str
+  statusUrl: str
+  eventsUrl: str
+  profileId: Optional[str] = None
+
+class IngestJobStatusResponse(BaseModel):
+  jobId: str
+  status: str
+  params: Dict[str, Any]
+  createdAt: str
+  startedAt: Optional[str] = None
+  finishedAt: Optional[str] = None
+  durationMs: Optional[float] = None
+  result: Optional[IngestResponse] = None
+  error: Optional[str] = None
+  events: List[Dict[str, Any]]
+  profileId: Optional[str] = None
+
+class MigrateResponse(BaseModel):
+  storageFormat: str
+  yearsMigrated: List[str]
+
+def verify_stats_secret(x_github_stats_secret: Optional[str]):
+  """Validate the X-GitHub-Stats-Secret header for write endpoints"""
+  if not GITHUB_STATS_SECRET:
+    raise HTTPException(
+      status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+      detail="GitHub stats secret not configured on server"
+    )
+
+  if not x_github_stats_secret or x_github_stats_secret != GITHUB_STATS_SECRET:
+    raise HTTPException(
+      status_code=status.HTTP_401_UNAUTHORIZED,
+      detail="Invalid or missing X-GitHub-Stats-Secret header"
+    )
 
 @router.get("/github-stats", response_model=GitHubStatsResponse)
 async def get_github_stats(
-  year: Optional[str] = Query(None, description="Filter by calendar year (e.g., '2024'). If not provided, returns all years aggregated.")
+  request: Request,
+  response: Response,
+  year: Optional[str] = Query(None, description="Filter by calendar year (e.g., '2024'). If not provided, returns all years aggregated."),
+  stream: Optional[str] = Query(None, pattern="^ndjson$", description="Set to 'ndjson' to stream contributions as newline-delimited JSON."),
+  from_date: Optional[str] = Query(None, alias="from", description="Start of a date window in YYYY-MM-DD format (inclusive)."),
+  to_date: Optional[str] = Query(None, alias="to", description="End of a date window in YYYY-MM-DD format (inclusive)."),
+  granularity: Optional[str] = Query(None, pattern="^(day|week|month|year)$", description="Sum counts per day, week (starting Monday), month or year.")
 ):
   """Retrieve stored GitHub contribution statistics
   
   Query Parameters:
     - year: Optional calendar year filter (e.g., "2024"). Returns only that year's data.
             If omitted, returns aggregated data from all available years.
+    - stream: Optional "ndjson". Streams one JSON object per line: a header with lastUpdated,
+              username and years, then one {"date", "count"} per day, then {"totalContributions"}.
+              Memory stays flat however many years are stored.
+    - from / to: Optional inclusive date window (YYYY-MM-DD). Combined with year, narrows that year.
+    - granularity: Optional bucket size (day, week, month, year). Each contribution's date is the
+                   first day of its bucket. Defaults to day when from or to is given.
   """
   try:
     service = GitHubStatsService()
-    stats = service.get_github_stats(year=year)
-    
-    if not stats:
-      raise HTTPException(
-        status_code=status.HTTP_404_NOT_FOUND,
-        detail=f"GitHub stats not found{' for year ' + year if year else ''}. Please ingest data first."
+
+    # A window or granularity selects the server-side series instead of the stored view
+    is_series = bool(from_date or to_date or granularity)
+    if is_series:
+      if stream:
+        raise HTTPException(
+          status_code=status.HTTP_400_BAD_REQUEST,
+          detail="stream=ndjson can't be combined with from, to or granularity"
+        )
+      try:
+        window_from = date.fromisoformat(from_date) if from_date else None
+        window_to = date.fromisoformat(to_date) if to_date else None
+        year_from, year_to = (date(int(year), 1, 1), date(int(year), 12, 31)) if year else (None, None)
+      except ValueError as e:
+        raise HTTPException(
+          status_code=status.HTTP_400_BAD_REQUEST,
+          detail=f"Invalid date: {str(e)}"
+        )
+      if window_from and window_to and window_from > window_to:
+        raise HTTPException(
+          status_code=status.HTTP_400_BAD_REQUEST,
+          detail="from must be on or before to"
+        )
+      if year:
+        # year narrows the window to the part inside that year
+        window_from = max(window_from, year_from) if window_from else year_from
+        window_to = min(window_to, year_to) if window_to else year_to
+        if window_from > window_to:
+          raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"from and to must overlap year {year}"
+          )
+
+    not_found = HTTPException(
+      status_code=status.HTTP_404_NOT_FOUND,
+      detail=f"GitHub stats not found{' for year ' + year if year else ''}. Please ingest data first."
+    )
+
+    # Every ingest stamps lastUpdated in the metadata record, so it identifies the
+    # stored contributions and repeat visitors get a 304 without loading them
+    metadata = await service.get_ingest_metadata()
+    if not metadata or (year and year not in metadata.get("years", [])):
+      raise not_found
+
+    etag = compute_etag([metadata.get("lastUpdated"), year, metadata.get("years"), from_date, to_date, granularity])
+    not_modified = conditional_response(request, response, etag, "github_stats")
+    if not_modified:
+      return not_modified
+
+    if stream == "ndjson":
+      return StreamingResponse(
+        stream_github_stats_ndjson(service, metadata, year),
+        media_type="application/x-ndjson",
+        headers={"ETag": etag, "Cache-Control": get_cache_control("github_stats")}
       )
-    
-    return GitHubStatsResponse(
+
+    if is_series:
+      stats = await service.get_contribution_series(window_from, window_to, granularity or "day")
+      if not stats:
+        raise not_found
+      # The series can be the object held by the stale store, so don't modify it in place
+      stats = {**stats, "year": year}
+    else:
+      stats = await service.get_github_stats(year=year)
+      if not stats:
+        raise not_found
+
+    return trusted_response(GitHubStatsResponse, dict(
       contributions=stats.get("contributions", []),
       totalContributions=stats.get("totalContributions", 0),
       lastUpdated=stats.get("lastUpdated"),
       username=stats.get("username"),
       year=stats.get("year"),
-      years=stats.get("years")
-    )
+      years=stats.get("years"),
+      fromDate=stats.get("fromDate"),
+      toDate=stats.get("toDate"),
+      granularity=stats.get("granularity")
+    ), response)
   except HTTPException:
     # Re-raise HTTP exceptions (like 404)
     raise
@@ -68,67 +201,152 @@ async def get_github_stats(
       detail="Service temporarily unavailable. Please try again later."
     )
 
-@router.post("/github-stats/ingest", response_model=IngestResponse)
+async def stream_github_stats_ndjson(service: GitHubStatsService, metadata: Dict, year: Optional[str]) -> AsyncIterator[str]:
+  """Emit the header, each year's contributions as they come off the cursor, then the total"""
+  yield json.dumps({
+    "lastUpdated": metadata.get("lastUpdated"),
+    "username": metadata.get("username"),
+    "year": year,
+    "years": [year] if year else metadata.get("years", [])
+  }) + "\n"
+
+  total_contributions = 0
+  try:
+    async for _, contributions, year_total in service.iter_year_contributions(year):
+      total_contributions += year_total
+      yield "".join(json.dumps(contribution) + "\n" for contribution in contributions)
+  except Exception as e:
+    # Headers are already sent, so end the stream with an error line instead of a status code
+    print(f"Error streaming GitHub stats: {str(e)}")
+    yield json.dumps({"error": "Service temporarily unavailable. Please try again later."}) + "\n"
+    return
+
+  yield json.dumps({"totalContributions": total_contributions}) + "\n"
+
+@router.post("/github-stats/ingest", response_model=IngestJobResponse, status_code=status.HTTP_202_ACCEPTED)
 async def ingest_github_stats(
   x_github_stats_secret: Optional[str] = Header(None, alias="X-GitHub-Stats-Secret"),
   from_date: Optional[str] = Query(None, description="Start date in YYYY-MM-DD format (e.g., 2020-01-01)"),
   to_date: Optional[str] = Query(None, description="End date in YYYY-MM-DD format (e.g., 2024-12-31). Defaults to today if not provided."),
-  force_full_load: bool = Query(False, description="If true, replace all existing data instead of merging")
+  force_full_load: bool = Query(False, description="If true, replace all existing data instead of merging"),
+  x_profile_secret: Optional[str] = Header(None, alias=PROFILE_HEADER)
 ):
-  """Ingest GitHub contribution data from GitHub API
-  
+  """Start a background ingest of GitHub contribution data from GitHub API
+
+  Returns 202 with a job id right away. Poll GET /github-stats/ingest/{job_id} for the
+  outcome, or follow GET /github-stats/ingest/{job_id}/events for progress as Server-Sent Events.
+
   Query Parameters:
     - from_date: Optional start date (YYYY-MM-DD). If provided with to_date, fetches that specific range.
     - to_date: Optional end date (YYYY-MM-DD). Defaults to today if not provided.
     - force_full_load: If true, replaces all existing data. Otherwise merges with existing data.
+
+  With a valid X-Profile-Secret header the job runs under cProfile, and its report id is
+  returned as profileId.
   
   Examples:
     - Full initial load from 2020: ?from_date=2020-01-01&to_date=2024-12-31&force_full_load=true
     - Incremental update (default): No parameters
   """
-  # Validate secret header
-  if not GITHUB_STATS_SECRET:
-    raise HTTPException(
-      status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-      detail="GitHub stats secret not configured on server"
-    )
-  
-  if not x_github_stats_secret or x_github_stats_secret != GITHUB_STATS_SECRET:
+  verify_stats_secret(x_github_stats_secret)
+
+  job_service = IngestJobService()
+  active_job = job_service.get_active_job()
+  if active_job:
     raise HTTPException(
-      status_code=status.HTTP_401_UNAUTHORIZED,
-      detail="Invalid or missing X-GitHub-Stats-Secret header"
+      status_code=status.HTTP_409_CONFLICT,
+      detail=f"Ingest job {active_job.id} is already running"
     )
-  
-  service = GitHubStatsService()
-  
+
   # Check rate limit (skip if custom date range is provided, as it's likely an initial load)
   if not from_date:
-    can_proceed, rate_limit_message = service.check_rate_limit()
+    can_proceed, rate_limit_message = await GitHubStatsService().check_rate_limit()
     if not can_proceed:
       raise HTTPException(
         status_code=status.HTTP_429_TOO_MANY_REQUESTS,
         detail=rate_limit_message
       )
-  
+
+  # If from_date is provided but to_date is not, default to today
+  if from_date and not to_date:
+    to_date = datetime.now().strftime("%Y-%m-%d")
+
+  # Reject bad dates now rather than failing the job later
   try:
-    # If from_date is provided but to_date is not, default to today
-    if from_date and not to_date:
-      to_date = datetime.now().strftime("%Y-%m-%d")
-    
-    result = await service.ingest_contributions(
-      from_date=from_date,
-      to_date=to_date,
-      force_full_load=force_full_load
-    )
-    return IngestResponse(**result)
+    for value in (from_date, to_date):
+      if value:
+        datetime.fromisoformat(value)
   except ValueError as e:
     raise HTTPException(
-      status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-      detail=str(e)
+      status_code=status.HTTP_400_BAD_REQUEST,
+      detail=f"Invalid date: {str(e)}"
+    )
+
+  job = job_service.start_job({
+    "from_date": from_date,
+    "to_date": to_date,
+    "force_full_load": force_full_load
+  }, profile=profiling_authorized(x_profile_secret))
+  return IngestJobResponse(
+    jobId=job.id,
+    status=job.status,
+    createdAt=job.created_at,
+    statusUrl=f"/github-stats/ingest/{job.id}",
+    eventsUrl=f"/github-stats/ingest/{job.id}/events",
+    profileId=job.to_dict()["profileId"]
+  )
+
+def get_ingest_job(job_id: str):
+  job = IngestJobService().get_job(job_id)
+  if not job:
+    raise HTTPException(
+      status_code=status.HTTP_404_NOT_FOUND,
+      detail=f"Ingest job {job_id} not found"
     )
+  return job
+
+@router.get("/github-stats/ingest/{job_id}", response_model=IngestJobStatusResponse)
+async def get_ingest_job_status(
+  job_id: str,
+  x_github_stats_secret: Optional[str] = Header(None, alias="X-GitHub-Stats-Secret")
+):
+  """Report the status, timings, result or error of a background ingest job"""
+  verify_stats_secret(x_github_stats_secret)
+  return IngestJobStatusResponse(**get_ingest_job(job_id).to_dict())
+
+@router.get("/github-stats/ingest/{job_id}/events")
+async def stream_ingest_job_events(
+  job_id: str,
+  x_github_stats_secret: Optional[str] = Header(None, alias="X-GitHub-Stats-Secret")
+):
+  """Stream a background ingest job's progress as Server-Sent Events
+
+  Replays events so far, then sends per-chunk fetch progress, storage timings and the
+  final completed or failed event before closing.
+  """
+  verify_stats_secret(x_github_stats_secret)
+  job = get_ingest_job(job_id)
+  return StreamingResponse(
+    IngestJobService().stream_events(job),
+    media_type="text/event-stream",
+    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+  )
+
+@router.post("/github-stats/migrate", response_model=MigrateResponse)
+async def migrate_github_stats(
+  x_github_stats_secret: Optional[str] = Header(None, alias="X-GitHub-Stats-Secret")
+):
+  """Rewrite stored year documents in the configured storage format (GITHUB_STATS_STORAGE_FORMAT)
+
+  Year documents already in that format are left untouched, so this is safe to re-run.
+  """
+  verify_stats_secret(x_github_stats_secret)
+
+  try:
+    years_migrated = await GitHubStatsService().migrate_storage_format()
+    return MigrateResponse(storageFormat=STORAGE_FORMAT, yearsMigrated=years_migrated)
   except Exception as e:
     raise HTTPException(
       status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-      detail=f"Failed to ingest GitHub stats: {str(e)}"
+      detail=f"Failed to migrate GitHub stats: {str(e)}"
     )
-
@@ -1,6 +1,10 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Response, status
 from datetime import datetime
 from .version import __version__
+from util.cache import get_cache_stats, get_stale_stats
+from util.compression import get_compression_stats
+from util.db import ping_database
+from util.startup import startup_report
 
 router = APIRouter(tags=["health"])
 
@@ -11,4 +15,25 @@ async def health_check():
     "message": "API is running",
     "version": __version__,
     "timestamp": datetime.now(),
-  }
\ No newline at end of file
+    "cache": get_cache_stats(),
+    "stale": get_stale_stats(),
+    "compression": get_compression_stats(),
+  }
+
+@router.get("/ready", response_model=dict)
+async def readiness_check(response: Response):
+  """Readiness probe: 503 until MongoDB answers a ping
+
+  /health only says the process is up. The ping result is reused for
+  READY_PING_TTL_SECONDS so frequent probes don't each hit the cluster.
+  """
+  database = await ping_database()
+  response.headers["Cache-Control"] = "no-store"
+  if not database["ok"]:
+    response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+  return {
+    "status": "ready" if database["ok"] else "not ready",
+    "version": __version__,
+    "database": database,
+    "startup": startup_report,
+  }
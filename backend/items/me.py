@@ -1,6 +1,7 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, Response, status
 from pydantic import BaseModel
 from lib.me_service import MeService
+from util.http import json_response
 
 router = APIRouter(tags=["me"])
 
@@ -11,30 +12,34 @@ class MeResponse(BaseModel):
   avatarUrl: str
   skills: dict
 
+def shape_me(me_data: dict) -> dict:
+  """The profile document with defaults for anything missing"""
+  return dict(
+    name=me_data.get("name", ""),
+    experiences=me_data.get("experiences", []),
+    title=me_data.get("title", ""),
+    avatarUrl=me_data.get("avatarUrl", ""),
+    skills=me_data.get("skills", {
+      "languages": [],
+      "frameworks": [],
+      "systems": [],
+      "databases": [],
+      "tools": [],
+      "soft_skills": [],
+      "other": [],
+    }),
+  )
+
 @router.get("/me", response_model=MeResponse)
-async def get_me():
+async def get_me(request: Request, response: Response):
   try:
-    me_data = MeService().get_me()
+    me_data = await MeService().get_me()
     if not me_data:
       raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
         detail="Profile data not found"
       )
-    return MeResponse(
-      name=me_data.get("name", ""),
-      experiences=me_data.get("experiences", []),
-      title=me_data.get("title", ""),
-      avatarUrl=me_data.get("avatarUrl", ""),
-      skills=me_data.get("skills", {
-        "languages": [],
-        "frameworks": [],
-        "systems": [],
-        "databases": [],
-        "tools": [],
-        "soft_skills": [],
-        "other": [],
-      }),
-    )
+    return json_response(request, response, MeResponse, shape_me(me_data), "me")
   except HTTPException:
     raise
   except Exception as e:
@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from util.cache import get_cache_stats, get_stale_stats
+from util.compression import get_compression_stats
+from util.metrics import render_metrics
+
+router = APIRouter(tags=["health"])
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+  """Prometheus text exposition of route, MongoDB, GitHub and cache metrics"""
+  return PlainTextResponse(
+    render_metrics({
+      "service": get_cache_stats(),
+      "stale": get_stale_stats(),
+      "compression": get_compression_stats(),
+    }),
+    media_type="text/plain; version=0.0.4",
+  )
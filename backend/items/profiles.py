@@ -0,0 +1,41 @@
+from fastapi import APIRouter, HTTPException, Header, status
+from pydantic import BaseModel
+from util.profiling import PROFILE_HEADER, get_report, list_reports, profiling_authorized
+from typing import List, Optional
+
+router = APIRouter(tags=["profiling"])
+
+class ProfileSummary(BaseModel):
+  profileId: str
+  label: str
+  createdAt: str
+  durationMs: float
+
+class ProfileReport(ProfileSummary):
+  report: str
+
+def verify_profiling_secret(x_profile_secret: Optional[str]):
+  """Validate the X-Profile-Secret header; profiling is hidden entirely when no secret is configured"""
+  if not profiling_authorized(x_profile_secret):
+    raise HTTPException(
+      status_code=status.HTTP_404_NOT_FOUND,
+      detail="Not Found"
+    )
+
+@router.get("/profiles", response_model=List[ProfileSummary], include_in_schema=False)
+async def get_profiles(x_profile_secret: Optional[str] = Header(None, alias=PROFILE_HEADER)):
+  """List stored profiling reports, newest first"""
+  verify_profiling_secret(x_profile_secret)
+  return list_reports()
+
+@router.get("/profiles/{profile_id}", response_model=ProfileReport, include_in_schema=False)
+async def get_profile(profile_id: str, x_profile_secret: Optional[str] = Header(None, alias=PROFILE_HEADER)):
+  """Retrieve a cProfile report, sorted by cumulative time"""
+  verify_profiling_secret(x_profile_secret)
+  report = get_report(profile_id)
+  if not report:
+    raise HTTPException(
+      status_code=status.HTTP_404_NOT_FOUND,
+      detail=f"Profile {profile_id} not found or still running"
+    )
+  return report
@@ -1,6 +1,8 @@
-from fastapi import APIRouter, HTTPException, status, Query
+from fastapi import APIRouter, HTTPException, Request, Response, status, Query
 from pydantic import BaseModel
 from lib.projects_service import ProjectsService
+from util.http import compute_etag, conditional_response, json_response
+from util.pagination import MAX_PAGE_SIZE, parse_fields, split_page
 from typing import Optional, Dict
 
 router = APIRouter(tags=["projects"])
@@ -26,16 +28,31 @@ class EntityResponse(BaseModel):
 
 @router.get("/projects", response_model=list[ProjectResponse])
 async def get_projects(
-  entity: Optional[str] = Query(None, description="Filter results based on associated entity (Company, Individual, etc). If not provided, returns all projects.")
+  request: Request,
+  response: Response,
+  entity: Optional[str] = Query(None, description="Filter results based on associated entity (Company, Individual, etc). If not provided, returns all projects."),
+  limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size. The next page's cursor is returned in the X-Next-Cursor header."),
+  after: Optional[str] = Query(None, description="Cursor from a previous page's X-Next-Cursor header"),
+  fields: Optional[str] = Query(None, description="Comma-separated fields to return (e.g. title,entity,technologies)")
 ):
   """Retrieves stored projects
 
   Query Parameters:
     - entity: Optional Entity Filter ('Self', 'Tagboard', etc). Returns only projects associated to that entity. If omitted, returns all projects.
+    - limit: Optional page size. When more projects follow, X-Next-Cursor holds the cursor for the next page.
+    - after: Optional cursor to continue from.
+    - fields: Optional comma-separated fields; only those are read from the database and returned.
   """
+  field_names = parse_fields(ProjectResponse, fields)
   try:
-    projects = ProjectsService().get_projects(entity=entity)
-    return projects
+    service = ProjectsService()
+    projects = await service.get_projects(entity=entity, limit=limit, after=after, fields=field_names)
+    page = split_page(projects, limit, service.page_cursor, response)
+    # The ETag is hashed from the page as returned, so each limit, after and fields combination gets its own
+    return json_response(request, response, ProjectResponse, page, "projects", field_names)
+  except ValueError as e:
+    # Malformed after cursor
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
   except Exception as e:
     raise HTTPException(
       status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -43,7 +60,7 @@ async def get_projects(
     )
 
 @router.get("/projects/entities", response_model=EntityResponse, description="Filter results based on entity description. If not provided, returns all entities.")
-async def get_entities():
+async def get_entities(request: Request, response: Response):
   """Retrieves all unique entities from projects
 
   Query Parameters:
@@ -53,7 +70,10 @@ async def get_entities():
     - A list of all unique entities from projects
   """
   try:
-    entities = ProjectsService().get_entities()
+    entities = await ProjectsService().get_entities()
+    not_modified = conditional_response(request, response, compute_etag(entities), "projects_entities")
+    if not_modified:
+      return not_modified
     return EntityResponse(entities=entities)
   except Exception as e:
     raise HTTPException(
@@ -72,7 +92,7 @@ async def create_project(project: ProjectResponse):
     - The created project
   """
   try:
-    project = ProjectsService().create_project(project=project)
+    project = await ProjectsService().create_project(project=project)
     return project
   except HTTPException:
     # Re-raise HTTP exceptions (like 404)
@@ -1,6 +1,8 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, Response, status, Query
 from pydantic import BaseModel
 from lib.roles_service import RolesService
+from util.http import json_response
+from util.pagination import MAX_PAGE_SIZE, parse_fields, split_page
 from bson import ObjectId
 from typing import Optional
 
@@ -19,10 +21,24 @@ class RoleResponse(BaseModel):
   dataTest: str
 
 @router.get("/roles", response_model=list[RoleResponse])
-async def get_roles():
+async def get_roles(
+  request: Request,
+  response: Response,
+  limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size. The next page's cursor is returned in the X-Next-Cursor header."),
+  after: Optional[str] = Query(None, description="Cursor from a previous page's X-Next-Cursor header"),
+  fields: Optional[str] = Query(None, description="Comma-separated fields to return (e.g. title,company,startDate)")
+):
+  """Retrieves roles, newest first, optionally paged and limited to some fields"""
+  field_names = parse_fields(RoleResponse, fields)
   try:
-    roles = RolesService().get_roles()
-    return [RoleResponse(**role) for role in roles]
+    service = RolesService()
+    roles = await service.get_roles(limit=limit, after=after, fields=field_names)
+    page = split_page(roles, limit, service.page_cursor, response)
+    # The ETag is hashed from the page as returned, so each limit, after and fields combination gets its own
+    return json_response(request, response, RoleResponse, page, "roles", field_names)
+  except ValueError as e:
+    # Malformed after cursor
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
   except Exception as e:
     print(f"Error in get_roles: {str(e)}")
     raise HTTPException(
@@ -1,4 +1,5 @@
 import util.db
+from util.cache import cached
 from pymongo.errors import ServerSelectionTimeoutError, ConnectionFailure, PyMongoError
 
 class ContactService:
@@ -8,18 +9,20 @@ class ContactService:
     self.contact_collection = util.db.get_collection(collection_name)
     self.specialties_collection = util.db.get_collection(specialties_collection_name)
 
-  def get_contact(self):
+  @cached("contact")
+  async def get_contact(self):
     try:
-      return [util.db.convert_objectid_to_str(contact) for contact in self.contact_collection.find()]
+      return await self.contact_collection.find().to_list(None)
     except (ServerSelectionTimeoutError, ConnectionFailure, PyMongoError) as e:
       print(f"MongoDB connection error in get_contact: {str(e)}")
-      # Return empty list instead of crashing
-      return []
+      # Raised so the cache layer can serve the last good result
+      raise
 
-  def get_specialties(self):
+  @cached("specialties")
+  async def get_specialties(self):
     try:
-      return [util.db.convert_objectid_to_str(specialty) for specialty in self.specialties_collection.find()]
+      return await self.specialties_collection.find().to_list(None)
     except (ServerSelectionTimeoutError, ConnectionFailure, PyMongoError) as e:
       print(f"MongoDB connection error in get_specialties: {str(e)}")
-      # Return empty list instead of crashing
-      return []
\ No newline at end of file
+      # Raised so the cache layer can serve the last good result
+      raise
\ No newline at end of file
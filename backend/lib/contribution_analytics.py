@@ -0,0 +1,114 @@
+from array import array
+from datetime import date
+from itertools import groupby
+from typing import Dict, List, Optional, Tuple
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+ROLLING_WINDOWS = (7, 30)
+PERCENTILES = (25, 50, 75, 90)
+
+def build_daily_series(segments: List[Tuple[str, array]]) -> Tuple[Optional[int], List[int]]:
+  """Lay year segments (start date, daily counts) onto one zero-filled series
+
+  Returns the ordinal of the first day and the counts from that day on.
+  """
+  segments = [(date.fromisoformat(start).toordinal(), counts) for start, counts in segments if start]
+  if not segments:
+    return None, []
+
+  first = min(start for start, _ in segments)
+  last = max(start + len(counts) for start, counts in segments)
+  series = [0] * (last - first)
+  for start, counts in segments:
+    series[start - first:start - first + len(counts)] = counts
+  return first, series
+
+def find_streaks(first: int, series: List[int]) -> Tuple[Dict, Dict]:
+  """Longest run of active days, and the run ending on the last (or second to last) day"""
+  longest = {"length": 0, "start": None, "end": None}
+  position = 0
+  for active, run in groupby(series, key=bool):
+    length = sum(1 for _ in run)
+    if active and length > longest["length"]:
+      longest = {
+        "length": length,
+        "start": date.fromordinal(first + position).isoformat(),
+        "end": date.fromordinal(first + position + length - 1).isoformat(),
+      }
+    position += length
+
+  # A quiet last day (usually today) doesn't break the current streak yet
+  end = len(series) - 1
+  if end >= 0 and not series[end]:
+    end -= 1
+  start = end
+  while start >= 0 and series[start]:
+    start -= 1
+  length = end - start
+  current = {
+    "length": length,
+    "start": date.fromordinal(first + start + 1).isoformat() if length else None,
+    "end": date.fromordinal(first + end).isoformat() if length else None,
+  }
+  return longest, current
+
+def percentile(sorted_values: List[int], rank: int) -> int:
+  """Nearest-rank percentile of an ascending list"""
+  if not sorted_values:
+    return 0
+  index = max(0, -(-rank * len(sorted_values) // 100) - 1)
+  return sorted_values[index]
+
+def compute_contribution_analytics(year_segments: Dict[str, Tuple[str, array]]) -> Optional[Dict]:
+  """Compute streaks, rolling averages, weekday totals and per-year percentile buckets
+
+  year_segments maps each year to its (start date, daily counts).
+  """
+  first, series = build_daily_series(list(year_segments.values()))
+  if first is None:
+    return None
+
+  longest_streak, current_streak = find_streaks(first, series)
+
+  rolling_averages = {
+    str(window): round(sum(series[-window:]) / min(window, len(series)), 2)
+    for window in ROLLING_WINDOWS
+  }
+
+  # The series starts on weekday(first), so each weekday is every 7th element from its offset
+  first_weekday = date.fromordinal(first).weekday()
+  weekday_totals = [0] * 7
+  weekday_days = [0] * 7
+  for offset in range(7):
+    values = series[offset::7]
+    weekday = (first_weekday + offset) % 7
+    weekday_totals[weekday] = sum(values)
+    weekday_days[weekday] = len(values)
+  busiest = max(range(7), key=lambda weekday: weekday_totals[weekday])
+
+  # Thresholds over active days let the heatmap pick colour levels per year
+  year_percentiles = {}
+  for year, (_, counts) in year_segments.items():
+    active = sorted(count for count in counts if count)
+    year_percentiles[year] = {
+      **{f"p{rank}": percentile(active, rank) for rank in PERCENTILES},
+      "max": active[-1] if active else 0,
+      "activeDays": len(active),
+    }
+
+  return {
+    "fromDate": date.fromordinal(first).isoformat(),
+    "toDate": date.fromordinal(first + len(series) - 1).isoformat(),
+    "totalContributions": sum(series),
+    "activeDays": sum(1 for count in series if count),
+    "longestStreak": longest_streak,
+    "currentStreak": current_streak,
+    "rollingAverages": rolling_averages,
+    "busiestWeekday": {
+      "weekday": WEEKDAYS[busiest],
+      "total": weekday_totals[busiest],
+      "average": round(weekday_totals[busiest] / weekday_days[busiest], 2) if weekday_days[busiest] else 0.0,
+    },
+    "weekdayTotals": {WEEKDAYS[weekday]: weekday_totals[weekday] for weekday in range(7)},
+    "yearPercentiles": year_percentiles,
+  }
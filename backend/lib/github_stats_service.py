@@ -1,10 +1,20 @@
 import util.db
+from util.cache import stale_if_error
+from lib.contribution_analytics import compute_contribution_analytics
+from util.indexes import declare_query
+from util.metrics import observe_github_request
 import os
+import sys
 import httpx
 import asyncio
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+import importlib.util
+import time
+from array import array
+from bson import Binary
+from datetime import date, datetime, timedelta
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
 from dotenv import load_dotenv
+from pymongo import ReplaceOne, UpdateOne
 from pymongo.errors import ServerSelectionTimeoutError, ConnectionFailure, PyMongoError
 
 load_dotenv()
@@ -12,21 +22,134 @@ load_dotenv()
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 GITHUB_API_URL = "https://api.github.com/graphql"
 
+# Year chunks packed into one GraphQL query (as aliased contributionsCollection fields)
+# and how many of those queries may be in flight at once
+GITHUB_CHUNKS_PER_QUERY = max(1, int(os.getenv("GITHUB_CHUNKS_PER_QUERY", "4")))
+GITHUB_FETCH_CONCURRENCY = max(1, int(os.getenv("GITHUB_FETCH_CONCURRENCY", "3")))
+
+# Precomputed aggregate of every year document, rebuilt on each ingest
+ALL_YEARS_ID = "all"
+
+# Streaks, averages and percentile buckets, recomputed when an ingest changes data
+ANALYTICS_ID = "analytics"
+
+# Small record of the last ingest (time, username, years, status) for cheap freshness checks
+INGEST_METADATA_ID = "ingest_metadata"
+
+# Year documents are keyed "YYYY". The range bounds the default _id index scan to
+# digit-leading ids, which a regex without a literal prefix can't do on its own.
+YEAR_ID_FILTER = {"$gte": "0000", "$lte": "9999", "$regex": "^\\d{4}$"}
+
+# "compact" stores each year as a start date plus packed daily counts,
+# "documents" keeps the original list of {"date", "count"} sub-documents
+STORAGE_FORMAT = os.getenv("GITHUB_STATS_STORAGE_FORMAT", "compact").lower()
+
+# Bucket sizes supported by get_contribution_series
+GRANULARITIES = ("day", "week", "month", "year")
+
+# Daily counts are packed as little-endian unsigned 32-bit integers
+COUNTS_TYPECODE = "I"
+
+# HTTP/2 needs the optional h2 package (pip install "httpx[http2]")
+GITHUB_HTTP2 = os.getenv("GITHUB_HTTP2", "false").lower() == "true" and importlib.util.find_spec("h2") is not None
+GITHUB_USERNAME_TTL_SECONDS = float(os.getenv("GITHUB_USERNAME_TTL_SECONDS", "86400"))
+
+# Shared keep-alive client for GitHub API calls, closed by the app lifespan
+_github_client: Optional[httpx.AsyncClient] = None
+
+# Username resolved from GITHUB_TOKEN, as (login, expires_at)
+_cached_username: Optional[Tuple[str, float]] = None
+
+def get_github_client() -> httpx.AsyncClient:
+  """Return the shared GitHub API client, creating it on first use"""
+  global _github_client
+  if _github_client is None or _github_client.is_closed:
+    _github_client = httpx.AsyncClient(
+      headers={
+        "Authorization": f"Bearer {GITHUB_TOKEN}",
+        "Content-Type": "application/json"
+      },
+      timeout=30.0,
+      limits=httpx.Limits(
+        max_connections=GITHUB_FETCH_CONCURRENCY,
+        max_keepalive_connections=GITHUB_FETCH_CONCURRENCY,
+        keepalive_expiry=60.0
+      ),
+      http2=GITHUB_HTTP2
+    )
+  return _github_client
+
+async def close_github_client():
+  global _github_client
+  if _github_client is not None:
+    await _github_client.aclose()
+    _github_client = None
+
+# Every lookup goes through _id, so the default _id index covers the collection
+declare_query("github_stats", {"_id": YEAR_ID_FILTER})
+declare_query("github_stats", {"_id": {"$in": ["2024", "2025"]}})
+
 class GitHubStatsService:
-  def __init__(self):
+  """Ingests GitHub contributions into the github_stats collection and reads them back
+
+  Database reads and writes raise PyMongoError so callers decide how to surface
+  failures. get_available_years, record_ingest and the ingest entry points log
+  them instead.
+  """
+
+  def __init__(self, progress: Optional[Callable[[str, Dict], None]] = None):
     collection_name = "github_stats"
     self.collection = util.db.get_collection(collection_name)
+    # Optional callback receiving (event, details) as an ingest progresses
+    self.progress = progress
+
+  def report_progress(self, event: str, **details):
+    if self.progress:
+      self.progress(event, details)
 
-  def get_available_years(self) -> List[str]:
+  async def get_available_years(self) -> List[str]:
     """Get list of available years in the database"""
     try:
-      year_docs = list(self.collection.find({"_id": {"$regex": "^\\d{4}$"}}).sort("_id", -1))
-      return [doc.get("_id") for doc in year_docs]
+      metadata = await self.get_ingest_metadata()
+      return sorted(metadata.get("years", []), reverse=True) if metadata else []
     except (ServerSelectionTimeoutError, ConnectionFailure, PyMongoError) as e:
       print(f"MongoDB connection error in get_available_years: {str(e)}")
       return []
 
-  def get_github_stats(self, year: Optional[str] = None) -> Optional[Dict]:
+  @stale_if_error("github_stats")
+  async def get_ingest_metadata(self) -> Optional[Dict]:
+    """Read the ingest metadata record with a single key lookup
+
+    Data ingested before the record existed falls back to a projection over the
+    year documents that skips their contributions.
+    """
+    metadata = await self.collection.find_one({"_id": INGEST_METADATA_ID})
+    if metadata:
+      return metadata
+
+    year_docs = await self.collection.find(
+      {"_id": YEAR_ID_FILTER},
+      projection={"lastUpdated": 1, "username": 1}
+    ).sort("_id", 1).to_list(None)
+    if not year_docs:
+      return None
+
+    return {
+      "_id": INGEST_METADATA_ID,
+      "lastUpdated": max((doc.get("lastUpdated") or "" for doc in year_docs), default=None) or None,
+      "username": year_docs[0].get("username"),
+      "years": [doc["_id"] for doc in year_docs]
+    }
+
+  async def record_ingest(self, fields: Dict):
+    """Update the ingest metadata record, logging rather than raising on failure"""
+    try:
+      await self.collection.update_one({"_id": INGEST_METADATA_ID}, {"$set": fields}, upsert=True)
+    except (ServerSelectionTimeoutError, ConnectionFailure, PyMongoError) as e:
+      print(f"MongoDB connection error in record_ingest: {str(e)}")
+
+  @stale_if_error("github_stats")
+  async def get_github_stats(self, year: Optional[str] = None) -> Optional[Dict]:
     """Retrieve stored GitHub stats from database
     
     Args:
@@ -36,13 +159,12 @@ class GitHubStatsService:
     try:
       if year:
         # Get specific year document
-        year_doc = self.collection.find_one({"_id": year})
+        year_doc = await self.collection.find_one({"_id": year})
         if not year_doc:
           return None
-        
-        year_doc = util.db.convert_objectid_to_str(year_doc)
+
         return {
-          "contributions": year_doc.get("contributions", []),
+          "contributions": self.decode_stored_contributions(year_doc),
           "totalContributions": year_doc.get("totalContributions", 0),
           "lastUpdated": year_doc.get("lastUpdated"),
           "username": year_doc.get("username"),
@@ -50,54 +172,218 @@ class GitHubStatsService:
           "years": [year]  # Single year in list for consistency
         }
       else:
-        # Get all year documents and aggregate
-        year_docs = list(self.collection.find({"_id": {"$regex": "^\\d{4}$"}}).sort("_id", 1))
-        
-        if not year_docs:
-          return None
-        
-        # Aggregate contributions from all years
-        all_contributions = []
-        total_contributions = 0
-        latest_update = None
-        username = None
-        
-        for year_doc in year_docs:
-          year_doc = util.db.convert_objectid_to_str(year_doc)
-          year_contributions = year_doc.get("contributions", [])
-          all_contributions.extend(year_contributions)
-          total_contributions += year_doc.get("totalContributions", 0)
-          
-          # Track latest update time
-          year_update = year_doc.get("lastUpdated")
-          if year_update:
-            if not latest_update or year_update > latest_update:
-              latest_update = year_update
-          
-          # Get username from first document
-          if not username:
-            username = year_doc.get("username")
-        
-        # Sort contributions by date
-        all_contributions.sort(key=lambda x: x.get("date", ""))
-        
+        # Read the aggregate document materialized at ingest time
+        all_years_doc = await self.collection.find_one({"_id": ALL_YEARS_ID})
+        if not all_years_doc:
+          # Older data predates the aggregate document, so build it once now
+          all_years_doc = await self.refresh_all_years_stats()
+          if not all_years_doc:
+            return None
+
         return {
-          "contributions": all_contributions,
-          "totalContributions": total_contributions,
-          "lastUpdated": latest_update,
-          "username": username,
-          "years": [doc.get("_id") for doc in year_docs]
+          "contributions": self.decode_stored_contributions(all_years_doc),
+          "totalContributions": all_years_doc.get("totalContributions", 0),
+          "lastUpdated": all_years_doc.get("lastUpdated"),
+          "username": all_years_doc.get("username"),
+          "years": all_years_doc.get("years", [])
         }
     except (ServerSelectionTimeoutError, ConnectionFailure, PyMongoError) as e:
-      # Log the error but don't crash - return None so endpoint can handle gracefully
       print(f"MongoDB connection error in get_github_stats: {str(e)}")
+      # Raised so stale_if_error can serve the last good result
+      raise
+
+  async def iter_year_contributions(self, year: Optional[str] = None) -> AsyncIterator[Tuple[str, List[Dict[str, int]], int]]:
+    """Yield (year, contributions, total) one year document at a time, oldest first
+
+    Reads from a cursor so only one year is decoded in memory at once.
+    """
+    query = {"_id": year} if year else {"_id": YEAR_ID_FILTER}
+    cursor = self.collection.find(query, batch_size=1).sort("_id", 1)
+    async for year_doc in cursor:
+      yield year_doc["_id"], self.decode_stored_contributions(year_doc), year_doc.get("totalContributions", 0)
+
+  def bucket_start(self, day: date, granularity: str) -> date:
+    """First day of the bucket containing day (weeks start on Monday)"""
+    if granularity == "week":
+      return day - timedelta(days=day.weekday())
+    if granularity == "month":
+      return day.replace(day=1)
+    if granularity == "year":
+      return day.replace(month=1, day=1)
+    return day
+
+  @stale_if_error("github_stats")
+  async def get_contribution_series(
+    self,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+    granularity: str = "day"
+  ) -> Optional[Dict]:
+    """Sum stored daily counts over a date window into day, week, month or year buckets
+
+    Only the year documents overlapping the window are read, and each is sliced by
+    array offset rather than filtering per-day entries.
+    """
+    year_filter = dict(YEAR_ID_FILTER)
+    if from_date:
+      year_filter["$gte"] = str(from_date.year)
+    if to_date:
+      year_filter["$lte"] = str(to_date.year)
+    cursor = self.collection.find({"_id": year_filter}).sort("_id", 1)
+
+    buckets: Dict[str, int] = {}
+    latest_update = None
+    username = None
+    years = []
+    async for year_doc in cursor:
+      start_date, counts = self.get_stored_counts(year_doc)
+      if not start_date:
+        continue
+      years.append(year_doc["_id"])
+      if not username:
+        username = year_doc.get("username")
+      if year_doc.get("lastUpdated") and (not latest_update or year_doc["lastUpdated"] > latest_update):
+        latest_update = year_doc["lastUpdated"]
+
+      # Slice the counts array down to the part inside the window
+      start = date.fromisoformat(start_date).toordinal()
+      first = max(start, from_date.toordinal()) if from_date else start
+      last = min(start + len(counts) - 1, to_date.toordinal()) if to_date else start + len(counts) - 1
+      if last < first:
+        # The window ends before this year's stored days begin, or starts after they end
+        continue
+      window = counts[first - start:last - start + 1]
+
+      if granularity == "day":
+        for offset, count in enumerate(window):
+          buckets[date.fromordinal(first + offset).isoformat()] = count
+        continue
+
+      # Walk bucket by bucket, summing each bucket's slice of the window
+      position = first
+      while position <= last:
+        bucket = self.bucket_start(date.fromordinal(position), granularity)
+        if granularity == "week":
+          bucket_end = bucket.toordinal() + 6
+        elif granularity == "month":
+          bucket_end = (bucket.replace(day=28) + timedelta(days=4)).replace(day=1).toordinal() - 1
+        else:
+          bucket_end = bucket.replace(month=12, day=31).toordinal()
+        segment_end = min(bucket_end, last)
+        key = bucket.isoformat()
+        buckets[key] = buckets.get(key, 0) + sum(window[position - first:segment_end - first + 1])
+        position = segment_end + 1
+
+    if not years:
       return None
 
+    return {
+      "contributions": [{"date": key, "count": count} for key, count in buckets.items()],
+      "totalContributions": sum(buckets.values()),
+      "lastUpdated": latest_update,
+      "username": username,
+      "years": years,
+      "fromDate": from_date.isoformat() if from_date else None,
+      "toDate": to_date.isoformat() if to_date else None,
+      "granularity": granularity
+    }
+
+  @stale_if_error("github_stats")
+  async def get_analytics(self) -> Optional[Dict]:
+    """Read the analytics document stored at ingest time, computing it once if missing"""
+    analytics = await self.collection.find_one({"_id": ANALYTICS_ID})
+    if analytics:
+      return analytics
+    return await self.refresh_analytics()
+
+  async def refresh_analytics(self) -> Optional[Dict]:
+    """Recompute contribution analytics from the stored year documents and save them"""
+    year_docs = await self.collection.find({"_id": YEAR_ID_FILTER}).sort("_id", 1).to_list(None)
+    analytics = compute_contribution_analytics({doc["_id"]: self.get_stored_counts(doc) for doc in year_docs})
+    if not analytics:
+      return None
+
+    analytics["_id"] = ANALYTICS_ID
+    analytics["computedAt"] = datetime.utcnow().isoformat() + "Z"
+    analytics["lastUpdated"] = max((doc.get("lastUpdated") or "" for doc in year_docs), default=None) or None
+    await self.collection.replace_one({"_id": ANALYTICS_ID}, analytics, upsert=True)
+    self.report_progress("analytics_refreshed")
+    return analytics
+
+  async def refresh_all_years_stats(self) -> Optional[Dict]:
+    """Rebuild the aggregate all-years document from the stored year documents"""
+    year_docs = await self.collection.find({"_id": YEAR_ID_FILTER}).sort("_id", 1).to_list(None)
+
+    if not year_docs:
+      return None
+
+    # Aggregate each year's daily counts, in year order
+    segments = []
+    total_contributions = 0
+    latest_update = None
+    username = None
+
+    for year_doc in year_docs:
+      start_date, counts = self.get_stored_counts(year_doc)
+      if start_date:
+        segments.append((start_date, counts))
+      total_contributions += year_doc.get("totalContributions", 0)
+
+      # Track latest update time
+      year_update = year_doc.get("lastUpdated")
+      if year_update:
+        if not latest_update or year_update > latest_update:
+          latest_update = year_update
+
+      # Get username from first document
+      if not username:
+        username = year_doc.get("username")
+
+    all_years_doc = {
+      "_id": ALL_YEARS_ID,
+      "totalContributions": total_contributions,
+      "lastUpdated": latest_update,
+      "username": username,
+      "years": [doc.get("_id") for doc in year_docs]
+    }
+    if STORAGE_FORMAT == "compact":
+      all_years_doc["segments"] = [
+        {"startDate": start_date, "counts": self.pack_counts(counts)}
+        for start_date, counts in segments
+      ]
+    else:
+      all_years_doc["contributions"] = [
+        contribution
+        for start_date, counts in segments
+        for contribution in self.decode_contributions(start_date, counts)
+      ]
+    await self.collection.replace_one({"_id": ALL_YEARS_ID}, all_years_doc, upsert=True)
+    self.report_progress("aggregate_refreshed", years=all_years_doc["years"])
+    return all_years_doc
+
+  async def post_graphql(self, operation: str, payload: Dict) -> Dict:
+    """POST a GraphQL query, recording its latency and the remaining rate limit for /metrics"""
+    started = time.perf_counter()
+    response = None
+    try:
+      response = await get_github_client().post(GITHUB_API_URL, json=payload)
+      response.raise_for_status()
+      data = response.json()
+    except Exception:
+      observe_github_request(operation, time.perf_counter() - started, response.headers if response is not None else None, failed=True)
+      raise
+    observe_github_request(operation, time.perf_counter() - started, response.headers, failed="errors" in data)
+    return data
+
   async def fetch_github_username(self) -> str:
-    """Fetch GitHub username from token"""
+    """Fetch GitHub username from token, memoized for GITHUB_USERNAME_TTL_SECONDS"""
+    global _cached_username
     if not GITHUB_TOKEN:
       raise ValueError("GITHUB_TOKEN environment variable is not set")
-    
+
+    if _cached_username and _cached_username[1] > time.monotonic():
+      return _cached_username[0]
+
     query = """
     query {
       viewer {
@@ -106,23 +392,14 @@ class GitHubStatsService:
     }
     """
     
-    async with httpx.AsyncClient() as client:
-      response = await client.post(
-        GITHUB_API_URL,
-        json={"query": query},
-        headers={
-          "Authorization": f"Bearer {GITHUB_TOKEN}",
-          "Content-Type": "application/json"
-        },
-        timeout=30.0
-      )
-      response.raise_for_status()
-      data = response.json()
-      
-      if "errors" in data:
-        raise Exception(f"GitHub API error: {data['errors']}")
-      
-      return data["data"]["viewer"]["login"]
+    data = await self.post_graphql("viewer", {"query": query})
+
+    if "errors" in data:
+      raise Exception(f"GitHub API error: {data['errors']}")
+
+    username = data["data"]["viewer"]["login"]
+    _cached_username = (username, time.monotonic() + GITHUB_USERNAME_TTL_SECONDS)
+    return username
 
   async def fetch_contributions_single_year(
     self,
@@ -131,67 +408,80 @@ class GitHubStatsService:
     to_date: datetime
   ) -> List[Dict[str, int]]:
     """Fetch contributions for a single year (GitHub API limitation: max 1 year per request)"""
+    return await self.fetch_contributions_batch(username, [(from_date, to_date)])
+
+  async def fetch_contributions_batch(
+    self,
+    username: str,
+    date_ranges: List[Tuple[datetime, datetime]]
+  ) -> List[Dict[str, int]]:
+    """Fetch several date ranges of up to one year each in a single GraphQL request
+
+    Each range becomes an aliased contributionsCollection field, so one round trip
+    covers multiple years.
+    """
     if not GITHUB_TOKEN:
       raise ValueError("GITHUB_TOKEN environment variable is not set")
-    
-    # Format dates for GraphQL (ISO 8601)
-    from_date_str = from_date.strftime("%Y-%m-%dT00:00:00Z")
-    to_date_str = to_date.strftime("%Y-%m-%dT23:59:59Z")
-    
-    query = """
-    query($username: String!, $from: DateTime!, $to: DateTime!) {
-      user(login: $username) {
-        contributionsCollection(from: $from, to: $to) {
-          contributionCalendar {
-            weeks {
-              contributionDays {
+
+    variable_definitions = ["$username: String!"]
+    collections = []
+    variables = {"username": username}
+
+    for index, (from_date, to_date) in enumerate(date_ranges):
+      variable_definitions.append(f"$from{index}: DateTime!, $to{index}: DateTime!")
+      collections.append(f"""
+        range{index}: contributionsCollection(from: $from{index}, to: $to{index}) {{
+          contributionCalendar {{
+            weeks {{
+              contributionDays {{
                 date
                 contributionCount
-              }
-            }
-          }
-        }
-      }
-    }
+              }}
+            }}
+          }}
+        }}""")
+      # Format dates for GraphQL (ISO 8601)
+      variables[f"from{index}"] = from_date.strftime("%Y-%m-%dT00:00:00Z")
+      variables[f"to{index}"] = to_date.strftime("%Y-%m-%dT23:59:59Z")
+
+    query = f"""
+    query({", ".join(variable_definitions)}) {{
+      user(login: $username) {{{"".join(collections)}
+      }}
+    }}
     """
-    
-    variables = {
-      "username": username,
-      "from": from_date_str,
-      "to": to_date_str
-    }
-    
-    async with httpx.AsyncClient() as client:
-      response = await client.post(
-        GITHUB_API_URL,
-        json={"query": query, "variables": variables},
-        headers={
-          "Authorization": f"Bearer {GITHUB_TOKEN}",
-          "Content-Type": "application/json"
-        },
-        timeout=30.0
-      )
-      response.raise_for_status()
-      data = response.json()
-      
-      if "errors" in data:
-        raise Exception(f"GitHub API error: {data['errors']}")
-      
-      if not data.get("data", {}).get("user"):
-        raise Exception(f"User '{username}' not found")
-      
-      # Extract contributions
-      weeks = data["data"]["user"]["contributionsCollection"]["contributionCalendar"]["weeks"]
-      contributions = []
-      
+
+    data = await self.post_graphql("contributions", {"query": query, "variables": variables})
+
+    if "errors" in data:
+      raise Exception(f"GitHub API error: {data['errors']}")
+
+    if not data.get("data", {}).get("user"):
+      raise Exception(f"User '{username}' not found")
+
+    # Extract contributions in range order
+    contributions = []
+    for index in range(len(date_ranges)):
+      weeks = data["data"]["user"][f"range{index}"]["contributionCalendar"]["weeks"]
       for week in weeks:
         for day in week["contributionDays"]:
           contributions.append({
             "date": day["date"],
             "count": day["contributionCount"]
           })
-      
-      return contributions
+
+    return contributions
+
+  def split_date_range(self, from_date: datetime, to_date: datetime) -> List[Tuple[datetime, datetime]]:
+    """Split a date range into non-overlapping chunks of at most 365 days"""
+    chunks = []
+    current_from = from_date
+    while current_from.date() <= to_date.date():
+      # Each chunk covers whole days, so it ends 364 days after it starts
+      current_to = min(current_from + timedelta(days=364), to_date)
+      chunks.append((current_from, current_to))
+      current_from = current_to + timedelta(days=1)
+    return chunks
 
   async def fetch_contributions(
     self, 
@@ -199,45 +489,388 @@ class GitHubStatsService:
     from_date: Optional[datetime] = None,
     to_date: Optional[datetime] = None
   ) -> List[Dict[str, int]]:
-    """Fetch contributions from GitHub GraphQL API, handling multi-year ranges by splitting into year chunks"""
+    """Fetch contributions from GitHub GraphQL API, handling multi-year ranges by splitting into year chunks
+
+    Chunks are packed GITHUB_CHUNKS_PER_QUERY to a request and up to
+    GITHUB_FETCH_CONCURRENCY requests run at once, so a full backfill takes
+    roughly one round trip.
+    """
     # Default to last year if no dates provided
     if not to_date:
       to_date = datetime.now()
     if not from_date:
       from_date = to_date - timedelta(days=365)
-    
-    # Calculate the date range
-    date_diff = (to_date - from_date).days
-    
-    # If range is more than 1 year, split into year chunks
-    # GitHub API limitation: max 1 year per request
-    if date_diff > 365:
-      all_contributions = []
-      current_from = from_date
-      
-      while current_from < to_date:
-        # Calculate end date for this chunk (exactly 365 days from start, or to_date if less)
-        # Use timedelta to handle leap years correctly
-        one_year_later = current_from + timedelta(days=365)
-        current_to = min(one_year_later, to_date)
-        
-        # Fetch contributions for this year chunk
-        year_contributions = await self.fetch_contributions_single_year(
-          username, current_from, current_to
-        )
-        all_contributions.extend(year_contributions)
-        
-        # Move to next chunk (start exactly where previous chunk ended)
-        current_from = current_to
-        
-        # Small delay between requests to avoid rate limiting
-        if current_from < to_date:
-          await asyncio.sleep(0.5)
-      
-      return all_contributions
+
+    # GitHub API limitation: max 1 year per contributionsCollection
+    chunks = self.split_date_range(from_date, to_date)
+    batches = [
+      chunks[index:index + GITHUB_CHUNKS_PER_QUERY]
+      for index in range(0, len(chunks), GITHUB_CHUNKS_PER_QUERY)
+    ]
+
+    semaphore = asyncio.Semaphore(GITHUB_FETCH_CONCURRENCY)
+    started = time.perf_counter()
+    self.report_progress("fetch_started", chunks=len(chunks), requests=len(batches))
+
+    async def fetch_batch(batch: List[Tuple[datetime, datetime]]) -> List[Dict[str, int]]:
+      async with semaphore:
+        batch_started = time.perf_counter()
+        contributions = await self.fetch_contributions_batch(username, batch)
+        for chunk_from, chunk_to in batch:
+          self.report_progress(
+            "chunk_fetched",
+            fromDate=chunk_from.strftime("%Y-%m-%d"),
+            toDate=chunk_to.strftime("%Y-%m-%d"),
+            durationMs=round((time.perf_counter() - batch_started) * 1000, 1)
+          )
+        return contributions
+
+    # gather keeps results in batch order, so contributions stay sorted by date
+    batch_results = await asyncio.gather(*(fetch_batch(batch) for batch in batches))
+    contributions = [contribution for batch_contributions in batch_results for contribution in batch_contributions]
+    self.report_progress(
+      "fetch_completed",
+      days=len(contributions),
+      durationMs=round((time.perf_counter() - started) * 1000, 1)
+    )
+    return contributions
+
+  def pack_counts(self, counts: array) -> Binary:
+    """Pack daily counts into BSON binary"""
+    packed = array(COUNTS_TYPECODE, counts)
+    if sys.byteorder == "big":
+      packed.byteswap()
+    return Binary(packed.tobytes())
+
+  def unpack_counts(self, data: bytes) -> array:
+    """Unpack daily counts stored by pack_counts"""
+    counts = array(COUNTS_TYPECODE)
+    counts.frombytes(data)
+    if sys.byteorder == "big":
+      counts.byteswap()
+    return counts
+
+  def encode_contributions(self, contributions: List[Dict[str, int]]) -> Tuple[Optional[str], array]:
+    """Convert {"date", "count"} entries into a start date and one count per day
+
+    Days missing between the first and last date are stored as zero.
+    """
+    if not contributions:
+      return None, array(COUNTS_TYPECODE)
+
+    ordinals = {date.fromisoformat(item["date"]).toordinal(): item["count"] for item in contributions}
+    start = min(ordinals)
+    counts = array(COUNTS_TYPECODE, bytes(4 * (max(ordinals) - start + 1)))
+    for ordinal, count in ordinals.items():
+      counts[ordinal - start] = count
+    return date.fromordinal(start).isoformat(), counts
+
+  def decode_contributions(self, start_date: str, counts: array) -> List[Dict[str, int]]:
+    """Expand a start date and daily counts back into {"date", "count"} entries"""
+    start = date.fromisoformat(start_date).toordinal()
+    return [
+      {"date": date.fromordinal(start + offset).isoformat(), "count": count}
+      for offset, count in enumerate(counts)
+    ]
+
+  def get_stored_counts(self, doc: Dict) -> Tuple[Optional[str], array]:
+    """Read a year document's daily counts regardless of storage format"""
+    if "counts" in doc:
+      return doc.get("startDate"), self.unpack_counts(doc["counts"])
+    return self.encode_contributions(doc.get("contributions", []))
+
+  def decode_stored_contributions(self, doc: Dict) -> List[Dict[str, int]]:
+    """Return a stored year or all-years document's contributions as {"date", "count"} entries"""
+    if "segments" in doc:
+      return [
+        contribution
+        for segment in doc["segments"]
+        for contribution in self.decode_contributions(segment["startDate"], self.unpack_counts(segment["counts"]))
+      ]
+    if "counts" in doc:
+      return self.decode_contributions(doc["startDate"], self.unpack_counts(doc["counts"]))
+    return doc.get("contributions", [])
+
+  def merge_counts(
+    self,
+    existing_start: Optional[str],
+    existing_counts: array,
+    new_start: Optional[str],
+    new_counts: array
+  ) -> Tuple[Optional[str], array]:
+    """Merge new daily counts over existing ones, overwriting overlapping dates"""
+    if not existing_start:
+      return new_start, new_counts
+    if not new_start:
+      return existing_start, existing_counts
+
+    existing_from = date.fromisoformat(existing_start).toordinal()
+    new_from = date.fromisoformat(new_start).toordinal()
+    start = min(existing_from, new_from)
+    end = max(existing_from + len(existing_counts), new_from + len(new_counts))
+
+    merged = array(COUNTS_TYPECODE, bytes(4 * (end - start)))
+    offset = existing_from - start
+    merged[offset:offset + len(existing_counts)] = existing_counts
+    offset = new_from - start
+    merged[offset:offset + len(new_counts)] = new_counts
+    return date.fromordinal(start).isoformat(), merged
+
+  def set_day_counts(
+    self,
+    start_date: Optional[str],
+    counts: array,
+    contributions: List[Dict[str, int]]
+  ) -> Tuple[Optional[str], array]:
+    """Copy of counts with each given day set, widening the range for days outside it
+
+    Unlike merge_counts, days between the given ones keep their stored counts.
+    """
+    if not contributions:
+      return start_date, array(COUNTS_TYPECODE, counts)
+
+    ordinals = [date.fromisoformat(item["date"]).toordinal() for item in contributions]
+    stored_from = date.fromisoformat(start_date).toordinal() if start_date else min(ordinals)
+    start = min(stored_from, min(ordinals))
+    end = max(stored_from + len(counts), max(ordinals) + 1)
+
+    merged = array(COUNTS_TYPECODE, bytes(4 * (end - start)))
+    offset = stored_from - start
+    merged[offset:offset + len(counts)] = counts
+    for ordinal, item in zip(ordinals, contributions):
+      merged[ordinal - start] = item["count"]
+    return date.fromordinal(start).isoformat(), merged
+
+  def build_year_doc(
+    self,
+    year: str,
+    start_date: str,
+    counts: array,
+    last_updated: str,
+    username: str
+  ) -> Dict:
+    """Build a year document in the configured storage format"""
+    year_doc = {
+      "_id": year,
+      "lastUpdated": last_updated,
+      "totalContributions": sum(counts),
+      "username": username,
+      "year": int(year)
+    }
+    if STORAGE_FORMAT == "compact":
+      year_doc["startDate"] = start_date
+      year_doc["counts"] = self.pack_counts(counts)
     else:
-      # Single year or less - make one API call
-      return await self.fetch_contributions_single_year(username, from_date, to_date)
+      year_doc["contributions"] = self.decode_contributions(start_date, counts)
+    return year_doc
+
+  def group_contributions_by_year(self, contributions: List[Dict[str, int]]) -> Dict[str, List[Dict[str, int]]]:
+    """Group contributions by the year in their YYYY-MM-DD date"""
+    contributions_by_year = {}
+    for contrib in contributions:
+      year = contrib["date"][:4]
+      if year not in contributions_by_year:
+        contributions_by_year[year] = []
+      contributions_by_year[year].append(contrib)
+    return contributions_by_year
+
+  async def store_year_contributions(
+    self,
+    contributions_by_year: Dict[str, List[Dict[str, int]]],
+    username: str,
+    last_updated: str,
+    merge: bool
+  ) -> List[Dict]:
+    """Write each year's contributions, merging with stored days when requested
+
+    Existing year documents are loaded with one $in query and all years are
+    written with a single ordered bulk_write, so the number of round trips
+    doesn't grow with the number of years.
+
+    Returns per-year figures for the fetched and the stored data.
+    """
+    if not contributions_by_year:
+      return []
+
+    existing_year_docs = {}
+    if merge:
+      cursor = self.collection.find({"_id": {"$in": list(contributions_by_year)}})
+      existing_year_docs = {doc["_id"]: doc async for doc in cursor}
+
+    results = []
+    operations = []
+    for year, year_contributions in contributions_by_year.items():
+      start_date, counts = self.encode_contributions(year_contributions)
+      result = {
+        "year": year,
+        "fetchedDays": len(year_contributions),
+        "fetchedTotal": sum(item["count"] for item in year_contributions),
+      }
+
+      existing_year_doc = existing_year_docs.get(year)
+      if existing_year_doc:
+        existing_start, existing_counts = self.get_stored_counts(existing_year_doc)
+        start_date, counts = self.merge_counts(existing_start, existing_counts, start_date, counts)
+
+      operations.append(ReplaceOne(
+        {"_id": year},
+        self.build_year_doc(year, start_date, counts, last_updated, username),
+        upsert=True
+      ))
+      result["storedDays"] = len(counts)
+      result["storedTotal"] = sum(counts)
+      results.append(result)
+
+    started = time.perf_counter()
+    bulk_result = await self.collection.bulk_write(operations, ordered=True)
+    self.report_progress(
+      "years_stored",
+      years=list(contributions_by_year),
+      durationMs=round((time.perf_counter() - started) * 1000, 1)
+    )
+    # upserted_ids is keyed by operation index, which matches the results order
+    for index, result in enumerate(results):
+      result["created"] = index in bulk_result.upserted_ids
+    return results
+
+  async def apply_year_deltas(
+    self,
+    contributions_by_year: Dict[str, List[Dict[str, int]]],
+    username: str,
+    last_updated: str
+  ) -> List[Dict]:
+    """Apply only the days that differ from the stored year documents
+
+    Unchanged days are not rewritten. Compact documents rewrite their packed counts
+    field and total only when a day changed; documents-format years update changed
+    days in place, $push new ones and adjust totalContributions with $inc.
+    Years with no stored document are inserted whole.
+
+    Returns per-year figures including changedDays.
+    """
+    if not contributions_by_year:
+      return []
+
+    cursor = self.collection.find({"_id": {"$in": list(contributions_by_year)}})
+    existing_year_docs = {doc["_id"]: doc async for doc in cursor}
+
+    results = []
+    operations = []
+    for year, year_contributions in contributions_by_year.items():
+      result = {
+        "year": year,
+        "created": False,
+        "fetchedDays": len(year_contributions),
+        "fetchedTotal": sum(item["count"] for item in year_contributions),
+      }
+      results.append(result)
+
+      existing_year_doc = existing_year_docs.get(year)
+      if not existing_year_doc:
+        start_date, counts = self.encode_contributions(year_contributions)
+        operations.append(ReplaceOne(
+          {"_id": year},
+          self.build_year_doc(year, start_date, counts, last_updated, username),
+          upsert=True
+        ))
+        result.update(created=True, storedDays=len(counts), storedTotal=sum(counts), changedDays=len(counts))
+        continue
+
+      # Find the fetched days whose count differs from what is stored
+      stored_start, stored_counts = self.get_stored_counts(existing_year_doc)
+      stored_from = date.fromisoformat(stored_start).toordinal() if stored_start else 0
+      changed_days = []
+      count_delta = 0
+      for item in year_contributions:
+        offset = date.fromisoformat(item["date"]).toordinal() - stored_from
+        previous = stored_counts[offset] if stored_start and 0 <= offset < len(stored_counts) else None
+        if previous != item["count"]:
+          changed_days.append(item)
+          count_delta += item["count"] - (previous or 0)
+
+      stored_total = existing_year_doc.get("totalContributions", 0) + count_delta
+      update = {"$set": {"lastUpdated": last_updated, "username": username}}
+      if count_delta:
+        update["$inc"] = {"totalContributions": count_delta}
+
+      if not changed_days:
+        operations.append(UpdateOne({"_id": year}, update))
+        result.update(storedDays=len(stored_counts), storedTotal=stored_total, changedDays=0)
+      elif "counts" in existing_year_doc:
+        # Packed counts can't be updated per element, but the whole field is only ~1.5KB.
+        # The total is recomputed from them, so it can't drift from the stored days.
+        start_date, counts = self.set_day_counts(stored_start, stored_counts, changed_days)
+        update.pop("$inc", None)
+        update["$set"]["startDate"] = start_date
+        update["$set"]["counts"] = self.pack_counts(counts)
+        update["$set"]["totalContributions"] = sum(counts)
+        operations.append(UpdateOne({"_id": year}, update))
+        result.update(storedDays=len(counts), storedTotal=sum(counts), changedDays=len(changed_days))
+      else:
+        stored_contributions = existing_year_doc.get("contributions", [])
+        index_by_date = {item["date"]: index for index, item in enumerate(stored_contributions)}
+        last_stored_date = max(index_by_date, default="")
+        new_days = sorted(
+          (item for item in changed_days if item["date"] not in index_by_date),
+          key=lambda item: item["date"]
+        )
+
+        if new_days and new_days[0]["date"] < last_stored_date:
+          # Inserting before existing days would shift array positions, so rewrite the year
+          merged_contribs = self.merge_contributions(stored_contributions, changed_days)
+          operations.append(ReplaceOne(
+            {"_id": year},
+            {
+              "_id": year,
+              "contributions": merged_contribs,
+              "lastUpdated": last_updated,
+              "totalContributions": stored_total,
+              "username": username,
+              "year": int(year)
+            },
+            upsert=True
+          ))
+        else:
+          for item in changed_days:
+            if item["date"] in index_by_date:
+              update["$set"][f"contributions.{index_by_date[item['date']]}.count"] = item["count"]
+          operations.append(UpdateOne({"_id": year}, update))
+          if new_days:
+            # A positional $set and a $push on the same array must be separate updates
+            operations.append(UpdateOne({"_id": year}, {"$push": {"contributions": {"$each": new_days}}}))
+        result.update(
+          storedDays=len(stored_contributions) + len(new_days),
+          storedTotal=stored_total,
+          changedDays=len(changed_days)
+        )
+
+    started = time.perf_counter()
+    await self.collection.bulk_write(operations, ordered=True)
+    self.report_progress(
+      "years_stored",
+      years=list(contributions_by_year),
+      changedDays=sum(result["changedDays"] for result in results),
+      durationMs=round((time.perf_counter() - started) * 1000, 1)
+    )
+    return results
+
+  async def migrate_storage_format(self) -> List[str]:
+    """Rewrite every stored year document in the configured storage format"""
+    year_docs = await self.collection.find({"_id": YEAR_ID_FILTER}).sort("_id", 1).to_list(None)
+    years_migrated = []
+    for year_doc in year_docs:
+      is_compact = "counts" in year_doc
+      if is_compact == (STORAGE_FORMAT == "compact"):
+        continue
+      start_date, counts = self.get_stored_counts(year_doc)
+      migrated_doc = self.build_year_doc(
+        year_doc["_id"], start_date, counts, year_doc.get("lastUpdated"), year_doc.get("username")
+      )
+      await self.collection.replace_one({"_id": year_doc["_id"]}, migrated_doc, upsert=True)
+      years_migrated.append(year_doc["_id"])
+
+    await self.refresh_all_years_stats()
+    return years_migrated
 
   def merge_contributions(
     self, 
@@ -267,12 +900,62 @@ class GitHubStatsService:
     force_full_load: bool = False
   ) -> Dict:
     """Ingest contributions from GitHub API and store in database
-    
+
+    Records the outcome, duration and years present in the ingest metadata record.
+
     Args:
       from_date: Optional start date for data range (YYYY-MM-DD string or datetime)
       to_date: Optional end date for data range (YYYY-MM-DD string or datetime)
       force_full_load: If True, replace all existing data instead of merging
     """
+    started = time.perf_counter()
+    attempted_at = datetime.utcnow().isoformat() + "Z"
+
+    try:
+      existing_metadata = await self.get_ingest_metadata()
+    except (ServerSelectionTimeoutError, ConnectionFailure, PyMongoError) as e:
+      print(f"MongoDB connection error in ingest_contributions: {str(e)}")
+      existing_metadata = None
+
+    try:
+      result = await self.perform_ingest(existing_metadata, from_date, to_date, force_full_load)
+    except Exception as e:
+      await self.record_ingest({
+        "lastAttemptAt": attempted_at,
+        "lastStatus": "failed",
+        "lastError": str(e),
+        "lastDurationMs": round((time.perf_counter() - started) * 1000, 1)
+      })
+      raise
+
+    # Analytics only depend on stored counts, so skip them when nothing changed
+    if result.get("changedDays") != 0:
+      try:
+        await self.refresh_analytics()
+      except (ServerSelectionTimeoutError, ConnectionFailure, PyMongoError) as e:
+        print(f"MongoDB connection error refreshing analytics: {str(e)}")
+
+    previous_years = existing_metadata.get("years", []) if existing_metadata else []
+    await self.record_ingest({
+      "lastAttemptAt": attempted_at,
+      "lastUpdated": result["lastUpdated"],
+      "username": result.get("username"),
+      "years": sorted(set(previous_years) | set(result["yearsUpdated"])),
+      "lastStatus": result["status"],
+      "lastError": None,
+      "lastDurationMs": round((time.perf_counter() - started) * 1000, 1),
+      "lastYearsUpdated": result["yearsUpdated"]
+    })
+    return result
+
+  async def perform_ingest(
+    self,
+    existing_metadata: Optional[Dict],
+    from_date: Optional[datetime] = None,
+    to_date: Optional[datetime] = None,
+    force_full_load: bool = False
+  ) -> Dict:
+    """Fetch contributions and write them, choosing a range, incremental or initial load"""
     # Fetch username from token
     username = await self.fetch_github_username()
     
@@ -283,195 +966,92 @@ class GitHubStatsService:
       to_date = datetime.fromisoformat(to_date)
     
     # Check if we have existing data and should do incremental update
-    existing_stats = self.get_github_stats()
-    should_merge = not force_full_load and existing_stats and existing_stats.get("lastUpdated")
+    should_merge = not force_full_load and existing_metadata and existing_metadata.get("lastUpdated")
     
     if from_date and to_date:
       # Custom date range provided - fetch that range
       contributions = await self.fetch_contributions(username, from_date, to_date)
-      
-      # Group contributions by year
-      contributions_by_year = {}
-      for contrib in contributions:
-        year = contrib["date"][:4]  # Extract year from YYYY-MM-DD format
-        if year not in contributions_by_year:
-          contributions_by_year[year] = []
-        contributions_by_year[year].append(contrib)
-      
-      # Store/update each year as a separate document
-      total_contributions_all_years = 0
-      total_count_all_years = 0
-      years_updated = []
+      contributions_by_year = self.group_contributions_by_year(contributions)
       latest_update = datetime.utcnow().isoformat() + "Z"
-      
+
+      # Store/update each year as a separate document, merging unless this is a full load
       try:
-        for year, year_contributions in contributions_by_year.items():
-          year_total = sum(item["count"] for item in year_contributions)
-          total_contributions_all_years += year_total
-          total_count_all_years += len(year_contributions)
-          
-          year_doc = {
-            "_id": year,
-            "contributions": year_contributions,
-            "lastUpdated": latest_update,
-            "totalContributions": year_total,
-            "username": username,
-            "year": int(year)
-          }
-          
-          if force_full_load:
-            # Replace the year document
-            self.collection.replace_one(
-              {"_id": year},
-              year_doc,
-              upsert=True
-            )
-            years_updated.append(year)
-          elif should_merge:
-            # Merge with existing year data
-            existing_year_doc = self.collection.find_one({"_id": year})
-            if existing_year_doc:
-              existing_contribs = existing_year_doc.get("contributions", [])
-              merged_contribs = self.merge_contributions(existing_contribs, year_contributions)
-              year_doc["contributions"] = merged_contribs
-              year_doc["totalContributions"] = sum(item["count"] for item in merged_contribs)
-            
-            self.collection.replace_one(
-              {"_id": year},
-              year_doc,
-              upsert=True
-            )
-            years_updated.append(year)
-          else:
-            # Update or insert year document
-            self.collection.replace_one(
-              {"_id": year},
-              year_doc,
-              upsert=True
-            )
-            years_updated.append(year)
+        results = await self.store_year_contributions(
+          contributions_by_year, username, latest_update, merge=bool(should_merge)
+        )
+        await self.refresh_all_years_stats()
       except (ServerSelectionTimeoutError, ConnectionFailure, PyMongoError) as e:
         raise Exception(f"Failed to save to MongoDB: {str(e)}")
-      
+
       return {
         "status": "updated" if should_merge else "created",
-        "contributionsCount": total_count_all_years,
-        "totalContributions": total_contributions_all_years,
+        "contributionsCount": sum(result["fetchedDays"] for result in results),
+        "totalContributions": sum(result["fetchedTotal"] for result in results),
         "lastUpdated": latest_update,
-        "yearsUpdated": years_updated
+        "username": username,
+        "yearsUpdated": [result["year"] for result in results],
+        "years": results
       }
     elif should_merge:
       # Incremental update: fetch from 3 days before last update to today
-      last_updated = datetime.fromisoformat(existing_stats["lastUpdated"].replace("Z", "+00:00"))
+      # Stored timestamps are UTC, so compare them as naive UTC datetimes
+      last_updated = datetime.fromisoformat(existing_metadata["lastUpdated"].replace("Z", "+00:00")).replace(tzinfo=None)
       from_date = last_updated - timedelta(days=3)
-      to_date = datetime.now()
-      
-      # Fetch new contributions
+      to_date = datetime.utcnow()
+
+      # Fetch new contributions and write only the days that changed
       new_contributions = await self.fetch_contributions(username, from_date, to_date)
-      
-      # Group by year and update each year document
-      contributions_by_year = {}
-      for contrib in new_contributions:
-        year = contrib["date"][:4]
-        if year not in contributions_by_year:
-          contributions_by_year[year] = []
-        contributions_by_year[year].append(contrib)
-      
-      total_contributions_all_years = 0
-      total_count_all_years = 0
-      years_updated = []
+      contributions_by_year = self.group_contributions_by_year(new_contributions)
       latest_update = datetime.utcnow().isoformat() + "Z"
-      
+
       try:
-        for year, year_contributions in contributions_by_year.items():
-          # Get existing year data
-          existing_year_doc = self.collection.find_one({"_id": year})
-          existing_contribs = existing_year_doc.get("contributions", []) if existing_year_doc else []
-          
-          # Merge with new data
-          merged_contribs = self.merge_contributions(existing_contribs, year_contributions)
-          year_total = sum(item["count"] for item in merged_contribs)
-          total_contributions_all_years += year_total
-          total_count_all_years += len(merged_contribs)
-          
-          year_doc = {
-            "_id": year,
-            "contributions": merged_contribs,
-            "lastUpdated": latest_update,
-            "totalContributions": year_total,
-            "username": username,
-            "year": int(year)
-          }
-          
-          self.collection.replace_one(
-            {"_id": year},
-            year_doc,
-            upsert=True
-          )
-          years_updated.append(year)
+        results = await self.apply_year_deltas(contributions_by_year, username, latest_update)
+        changed_days = sum(result["changedDays"] for result in results)
+        if changed_days:
+          await self.refresh_all_years_stats()
+        else:
+          await self.collection.update_one({"_id": ALL_YEARS_ID}, {"$set": {"lastUpdated": latest_update}})
       except (ServerSelectionTimeoutError, ConnectionFailure, PyMongoError) as e:
         raise Exception(f"Failed to update MongoDB: {str(e)}")
-      
+
       return {
         "status": "updated",
-        "contributionsCount": total_count_all_years,
-        "totalContributions": total_contributions_all_years,
+        "changedDays": changed_days,
+        "contributionsCount": sum(result["storedDays"] for result in results),
+        "totalContributions": sum(result["storedTotal"] for result in results),
         "lastUpdated": latest_update,
-        "yearsUpdated": years_updated
+        "username": username,
+        "yearsUpdated": [result["year"] for result in results],
+        "years": results
       }
     else:
       # Initial load: fetch last year
       to_date = datetime.now()
       from_date = to_date - timedelta(days=365)
-      
+
       contributions = await self.fetch_contributions(username, from_date, to_date)
-      
-      # Group by year (should be just one year for initial load)
-      contributions_by_year = {}
-      for contrib in contributions:
-        year = contrib["date"][:4]
-        if year not in contributions_by_year:
-          contributions_by_year[year] = []
-        contributions_by_year[year].append(contrib)
-      
-      total_contributions_all_years = 0
-      total_count_all_years = 0
-      years_updated = []
+      contributions_by_year = self.group_contributions_by_year(contributions)
       latest_update = datetime.utcnow().isoformat() + "Z"
-      
+
       try:
-        for year, year_contributions in contributions_by_year.items():
-          year_total = sum(item["count"] for item in year_contributions)
-          total_contributions_all_years += year_total
-          total_count_all_years += len(year_contributions)
-          
-          year_doc = {
-            "_id": year,
-            "contributions": year_contributions,
-            "lastUpdated": latest_update,
-            "totalContributions": year_total,
-            "username": username,
-            "year": int(year)
-          }
-          
-          self.collection.replace_one(
-            {"_id": year},
-            year_doc,
-            upsert=True
-          )
-          years_updated.append(year)
+        results = await self.store_year_contributions(
+          contributions_by_year, username, latest_update, merge=False
+        )
+        await self.refresh_all_years_stats()
       except (ServerSelectionTimeoutError, ConnectionFailure, PyMongoError) as e:
         raise Exception(f"Failed to insert into MongoDB: {str(e)}")
-      
+
       return {
         "status": "created",
-        "contributionsCount": total_count_all_years,
-        "totalContributions": total_contributions_all_years,
+        "contributionsCount": sum(result["fetchedDays"] for result in results),
+        "totalContributions": sum(result["fetchedTotal"] for result in results),
         "lastUpdated": latest_update,
-        "yearsUpdated": years_updated
+        "username": username,
+        "yearsUpdated": [result["year"] for result in results],
+        "years": results
       }
 
-  def check_rate_limit(self) -> tuple[bool, Optional[str]]:
+  async def check_rate_limit(self) -> tuple[bool, Optional[str]]:
     """Check if ingestion can proceed based on rate limit (1 hour for non-dev environments)"""
     environment = os.getenv("ENVIRONMENT", "dev").lower()
     
@@ -481,8 +1061,8 @@ class GitHubStatsService:
     
     # Check rate limit for other environments
     try:
-      existing_stats = self.get_github_stats()
-      if not existing_stats or not existing_stats.get("lastUpdated"):
+      existing_metadata = await self.get_ingest_metadata()
+      if not existing_metadata or not existing_metadata.get("lastUpdated"):
         return True, None
     except Exception as e:
       # If we can't check rate limit due to DB issues, allow the request
@@ -491,7 +1071,7 @@ class GitHubStatsService:
     
     try:
       # Parse the ISO format timestamp (handles both with and without timezone)
-      last_updated_str = existing_stats["lastUpdated"]
+      last_updated_str = existing_metadata["lastUpdated"]
       if last_updated_str.endswith("Z"):
         last_updated_str = last_updated_str[:-1] + "+00:00"
       
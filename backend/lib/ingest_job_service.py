@@ -0,0 +1,143 @@
+import asyncio
+import json
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional
+from lib.github_stats_service import GitHubStatsService
+from util.profiling import ProfileSession
+
+# Finished jobs kept in memory for status polling
+MAX_FINISHED_JOBS = 20
+
+# Seconds between SSE keep-alive comments while a job is quiet
+KEEPALIVE_SECONDS = 15.0
+
+class IngestJob:
+  def __init__(self, params: Dict, profile: bool = False):
+    self.id = uuid.uuid4().hex
+    self.params = params
+    self.profile_session = ProfileSession(f"ingest {self.id}") if profile else None
+    self.status = "queued"
+    self.created_at = datetime.utcnow().isoformat() + "Z"
+    self.started_at: Optional[str] = None
+    self.finished_at: Optional[str] = None
+    self.duration_ms: Optional[float] = None
+    self.result: Optional[Dict] = None
+    self.error: Optional[str] = None
+    self.events: List[Dict] = []
+    self.task: Optional[asyncio.Task] = None
+    self._started = time.perf_counter()
+    self._changed = asyncio.Event()
+
+  @property
+  def finished(self) -> bool:
+    return self.status in ("succeeded", "failed", "cancelled")
+
+  def mark_cancelled(self):
+    self.error = "Ingest cancelled before it finished"
+    self.status = "cancelled"
+    self.add_event("cancelled", {"error": self.error})
+
+  def add_event(self, event: str, details: Optional[Dict] = None):
+    self.events.append({
+      "event": event,
+      "at": datetime.utcnow().isoformat() + "Z",
+      "elapsedMs": round((time.perf_counter() - self._started) * 1000, 1),
+      **(details or {}),
+    })
+    # Wake every waiting stream, then start a fresh event for the next change
+    self._changed.set()
+    self._changed = asyncio.Event()
+
+  async def wait_for_change(self, timeout: float) -> bool:
+    try:
+      await asyncio.wait_for(self._changed.wait(), timeout)
+      return True
+    except asyncio.TimeoutError:
+      return False
+
+  def to_dict(self) -> Dict:
+    return {
+      "jobId": self.id,
+      "status": self.status,
+      "params": self.params,
+      "createdAt": self.created_at,
+      "startedAt": self.started_at,
+      "finishedAt": self.finished_at,
+      "durationMs": self.duration_ms,
+      "result": self.result,
+      "error": self.error,
+      "events": self.events,
+      "profileId": self.profile_session.report_id if self.profile_session else None,
+    }
+
+# Jobs live in process memory, in creation order
+_jobs: "OrderedDict[str, IngestJob]" = OrderedDict()
+
+class IngestJobService:
+  def get_job(self, job_id: str) -> Optional[IngestJob]:
+    return _jobs.get(job_id)
+
+  def get_active_job(self) -> Optional[IngestJob]:
+    return next((job for job in _jobs.values() if not job.finished), None)
+
+  def start_job(self, params: Dict, profile: bool = False) -> IngestJob:
+    """Queue an ingest and run it in the background, under cProfile if profile is set"""
+    job = IngestJob(params, profile)
+    _jobs[job.id] = job
+    self.prune_jobs()
+    job.task = asyncio.create_task(self.run_profiled_job(job) if profile else self.run_job(job))
+    # A task cancelled before run_job started (e.g. waiting on the profiler) never marks the job itself
+    job.task.add_done_callback(lambda task: None if job.finished else job.mark_cancelled())
+    return job
+
+  async def run_profiled_job(self, job: IngestJob):
+    async with job.profile_session:
+      await self.run_job(job)
+
+  async def run_job(self, job: IngestJob):
+    job.status = "running"
+    job.started_at = datetime.utcnow().isoformat() + "Z"
+    job.add_event("started", {"params": job.params})
+    service = GitHubStatsService(progress=job.add_event)
+    try:
+      job.result = await service.ingest_contributions(**job.params)
+      job.status = "succeeded"
+      job.add_event("completed", {"status": job.result["status"]})
+    except asyncio.CancelledError:
+      # Shutdown cancels running jobs; an unfinished job would block every later ingest
+      job.mark_cancelled()
+      raise
+    except Exception as e:
+      job.error = f"Failed to ingest GitHub stats: {str(e)}"
+      job.status = "failed"
+      job.add_event("failed", {"error": job.error})
+    finally:
+      job.finished_at = datetime.utcnow().isoformat() + "Z"
+      job.duration_ms = round((time.perf_counter() - job._started) * 1000, 1)
+
+  def prune_jobs(self):
+    finished = [job_id for job_id, job in _jobs.items() if job.finished]
+    for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+      del _jobs[job_id]
+
+  async def stream_events(self, job: IngestJob) -> AsyncIterator[str]:
+    """Yield the job's events as Server-Sent Events until it finishes"""
+    sent = 0
+    while True:
+      while sent < len(job.events):
+        event = job.events[sent]
+        yield f"id: {sent}\nevent: {event['event']}\ndata: {json.dumps(event, default=str)}\n\n"
+        sent += 1
+      if job.finished:
+        return
+      if not await job.wait_for_change(KEEPALIVE_SECONDS):
+        yield ": keep-alive\n\n"
+
+async def cancel_ingest_jobs():
+  """Cancel background ingests that are still running at shutdown"""
+  for job in _jobs.values():
+    if job.task and not job.task.done():
+      job.task.cancel()
@@ -1,4 +1,5 @@
 import util.db
+from util.cache import cached
 from pymongo.errors import ServerSelectionTimeoutError, ConnectionFailure, PyMongoError
 
 class MeService:
@@ -6,13 +7,12 @@ class MeService:
     collection_name = "me"
     self.collection = util.db.get_collection(collection_name)
 
-  def get_me(self):
+  @cached("me")
+  async def get_me(self):
     try:
-      result = self.collection.find_one()
-      if result:
-        return util.db.convert_objectid_to_str(result)
-      return None
+      # The profile never exposes its _id, so don't fetch it
+      return await self.collection.find_one(projection={"_id": 0})
     except (ServerSelectionTimeoutError, ConnectionFailure, PyMongoError) as e:
       print(f"MongoDB connection error in get_me: {str(e)}")
-      # Return None instead of crashing
-      return None
\ No newline at end of file
+      # Raised so the cache layer can serve the last good result
+      raise
\ No newline at end of file
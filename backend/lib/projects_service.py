@@ -1,22 +1,62 @@
-from typing import Optional, Dict
+from typing import Any, Optional, Dict, List, Tuple
 import util.db
+from bson import ObjectId
+from bson.errors import InvalidId
+from util.cache import cached
+from util.indexes import declare_indexes, declare_query
+from util.pagination import build_projection, decode_cursor
+from pymongo import ASCENDING, IndexModel
 from pymongo.errors import ServerSelectionTimeoutError, ConnectionFailure, PyMongoError
 
+# get_projects filters on entity and pages in _id order; get_entities reads distinct entities
+declare_indexes("projects", IndexModel([("entity", ASCENDING), ("_id", ASCENDING)], name="entity_id"))
+declare_query("projects", {"entity": "Self"}, [("_id", ASCENDING)])
+declare_query("projects", {"entity": {"$exists": True}}, [("_id", ASCENDING)])
+
 class ProjectsService:
   def __init__(self):
     collection_name = "projects"
     self.collection = util.db.get_collection(collection_name)
 
-  def get_projects(self, entity: Optional[str] = None ) -> list[Dict]:
+  @staticmethod
+  def page_cursor(project: Dict) -> List[Any]:
+    return [project["_id"]]
+
+  @cached("projects")
+  async def get_projects(
+    self,
+    entity: Optional[str] = None,
+    limit: Optional[int] = None,
+    after: Optional[str] = None,
+    fields: Optional[Tuple[str, ...]] = None
+  ) -> list[Dict]:
+    """Projects in _id order, optionally a page of them with only some fields
+
+    With limit, one extra project is read so the caller can tell whether another page
+    follows, and _id is kept for its cursor. after is a cursor from page_cursor.
+    Raises ValueError for a malformed cursor.
+    """
+    query: Dict[str, Any] = {"entity": entity if entity else {"$exists": True}}
+    if after:
+      try:
+        query["_id"] = {"$gt": ObjectId(decode_cursor(after)[0])}
+      except (IndexError, InvalidId, TypeError):
+        raise ValueError("Invalid cursor")
+    # Projects are served without their _id, so leave it out unless a page needs it
+    projection = build_projection(fields, ("_id",) if limit else ())
     try:
-      return [util.db.convert_objectid_to_str(project) for project in self.collection.find({"entity": entity if entity else {"$exists": True}})]
+      cursor = self.collection.find(query, projection).sort("_id", ASCENDING)
+      if limit:
+        cursor = cursor.limit(limit + 1)
+      return await cursor.to_list(None)
     except (ServerSelectionTimeoutError, ConnectionFailure, PyMongoError) as e:
       print(f"MongoDB connection error in get_projects: {str(e)}")
-      return []
+      raise
 
-  def get_entities(self) -> list[str]:
+  @cached("projects")
+  async def get_entities(self) -> list[str]:
     try:
-      return [entity for entity in self.collection.distinct("entity")]
+      return [entity for entity in await self.collection.distinct("entity")]
     except (ServerSelectionTimeoutError, ConnectionFailure, PyMongoError) as e:
       print(f"MongoDB connection error in get_entities: {str(e)}")
-      return []
\ No newline at end of file
+      raise
\ No newline at end of file
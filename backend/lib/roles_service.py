@@ -1,15 +1,62 @@
+from typing import Any, Dict, List, Optional, Tuple
 import util.db
+from bson import ObjectId
+from bson.errors import InvalidId
+from util.cache import cached
+from util.indexes import declare_indexes, declare_query
+from util.pagination import build_projection, decode_cursor
+from pymongo import DESCENDING, IndexModel
 from pymongo.errors import ServerSelectionTimeoutError, ConnectionFailure, PyMongoError
 
+# Newest roles first, with _id breaking ties between roles that start the same day
+ROLES_SORT = [("startDate", DESCENDING), ("_id", DESCENDING)]
+
+declare_indexes("roles", IndexModel(ROLES_SORT, name="startDate_id_desc"))
+declare_query("roles", {}, ROLES_SORT)
+
 class RolesService:
   def __init__(self):
     collection_name = "roles"
     self.collection = util.db.get_collection(collection_name)
 
-  def get_roles(self):
+  @staticmethod
+  def page_cursor(role: Dict) -> List[Any]:
+    # Roles without a startDate sort last and page on _id alone
+    return [role.get("startDate"), role["_id"]]
+
+  @cached("roles")
+  async def get_roles(
+    self,
+    limit: Optional[int] = None,
+    after: Optional[str] = None,
+    fields: Optional[Tuple[str, ...]] = None
+  ) -> List[Dict]:
+    """Roles newest first, optionally a page of them with only some fields
+
+    With limit, one extra role is read so the caller can tell whether another page
+    follows. after is a cursor from page_cursor; a malformed one raises ValueError.
+    """
+    query: Dict[str, Any] = {}
+    if after:
+      try:
+        start_date, role_id = decode_cursor(after)
+        role_id = ObjectId(role_id)
+      except (ValueError, InvalidId, TypeError):
+        raise ValueError("Invalid cursor")
+      if start_date is None:
+        query = {"startDate": None, "_id": {"$lt": role_id}}
+      else:
+        # Missing startDates sort below every date, and {"$lt": date} only matches dates
+        query["$or"] = [
+          {"startDate": {"$lt": start_date}},
+          {"startDate": start_date, "_id": {"$lt": role_id}},
+          {"startDate": None},
+        ]
     try:
-      result = self.collection.find(sort=[("startDate", -1)])
-      return list(result)
+      result = self.collection.find(query, build_projection(fields, ("startDate", "_id")), sort=ROLES_SORT)
+      if limit:
+        result = result.limit(limit + 1)
+      return await result.to_list(None)
     except (ServerSelectionTimeoutError, ConnectionFailure, PyMongoError) as e:
       print(f"MongoDB connection error in get_roles: {str(e)}")
-      return []
\ No newline at end of file
+      raise
\ No newline at end of file
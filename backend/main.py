@@ -1,20 +1,61 @@
-from fastapi import FastAPI
+import time
+
+# Read before the other imports, so the startup budget covers them
+PROCESS_STARTED = time.perf_counter()
+
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from items import health, me, projects, contact, github_stats, roles
+from fastapi.responses import ORJSONResponse
+from items import health, metrics, profiles, bootstrap, me, projects, contact, github_stats, github_analytics, roles
 from items.version import __version__
+from lib.contact_service import ContactService
+from lib.github_stats_service import close_github_client
+from lib.ingest_job_service import cancel_ingest_jobs
+from lib.me_service import MeService
+from lib.projects_service import ProjectsService
+from lib.roles_service import RolesService
+from util.compression import CompressionMiddleware
+from util.http import STATIC_CACHE_CONTROL, ImmutableStaticFiles, StaleResponseMiddleware
+from util.metrics import MetricsMiddleware
+from util.profiling import PROFILING_SECRET, ProfilingMiddleware
+from util.startup import CACHE_PREWARM, cancel_startup, run_startup
+from contextlib import asynccontextmanager
 from datetime import datetime
 import os
+import util.db
 from dotenv import load_dotenv
 from pathlib import Path
 
 load_dotenv()
 
+# Cached service reads behind the public GET routes, filled at startup when CACHE_PREWARM is set
+CACHE_WARMUPS = [
+  lambda: MeService().get_me(),
+  lambda: RolesService().get_roles(),
+  lambda: ProjectsService().get_projects(),
+  lambda: ProjectsService().get_entities(),
+  lambda: ContactService().get_contact(),
+  lambda: ContactService().get_specialties(),
+]
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+  print(f"CORS origins: {list_cors_domains}")
+  await run_startup(PROCESS_STARTED, CACHE_WARMUPS if CACHE_PREWARM else [])
+  yield
+  await cancel_startup()
+  await cancel_ingest_jobs()
+  # Release pooled connections held for GitHub API calls and MongoDB
+  await close_github_client()
+  await util.db.close_client()
+
 app = FastAPI(
   title="Jake Kohl Portfolio",
   description="API for Jake Kohl's Software Engineering Portfolio",
   version=__version__,
   docs_url="/docs",
+  lifespan=lifespan,
+  default_response_class=ORJSONResponse,
 )
 
 list_cors_domains = []
@@ -27,28 +68,48 @@ else:
   for domain in cors_domains.split(","):
     list_cors_domains.append(domain.strip())
 
-print(list_cors_domains)
-
 app.add_middleware(
   CORSMiddleware,
   allow_origins=list_cors_domains,
   allow_credentials=True,
   allow_methods=["*"],
   allow_headers=["*"],
+  # Paged /projects and /roles responses carry the next page's cursor, stale ones their age
+  expose_headers=["X-Next-Cursor", "X-Stale-Age"],
 )
 
+# Flags responses served from last-known-good data while MongoDB is failing
+app.add_middleware(StaleResponseMiddleware)
+
+# gzip/brotli for large JSON payloads like the all-years /github-stats
+app.add_middleware(CompressionMiddleware)
+
+# Per-request cProfile, only installed when a secret is configured
+if PROFILING_SECRET:
+  app.add_middleware(ProfilingMiddleware)
+
+# Added last so it is outermost and times the whole request
+app.add_middleware(MetricsMiddleware)
+
 # Mount static files (for favicon.ico and other public assets)
 public_dir = Path(__file__).parent / "public"
 if public_dir.exists():
-    app.mount("/static", StaticFiles(directory=str(public_dir)), name="static")
+    app.mount("/static", ImmutableStaticFiles(directory=str(public_dir)), name="static")
 
 # Include routers
 app.include_router(health.router)
-app.include_router(me.router)
-app.include_router(roles.router)
-app.include_router(projects.router)
-app.include_router(contact.router)
-app.include_router(github_stats.router)
+app.include_router(metrics.router)
+app.include_router(profiles.router)
+
+# Routers that read MongoDB wait for the client to exist, which is created off the event loop
+requires_database = [Depends(util.db.require_client)]
+app.include_router(bootstrap.router, dependencies=requires_database)
+app.include_router(me.router, dependencies=requires_database)
+app.include_router(roles.router, dependencies=requires_database)
+app.include_router(projects.router, dependencies=requires_database)
+app.include_router(contact.router, dependencies=requires_database)
+app.include_router(github_analytics.router, dependencies=requires_database)
+app.include_router(github_stats.router, dependencies=requires_database)
 
 @app.get("/" , tags=["root"])
 async def root():
@@ -70,5 +131,5 @@ async def favicon():
     from fastapi.responses import FileResponse
     favicon_path = public_dir / "favicon.ico"
     if favicon_path.exists():
-        return FileResponse(str(favicon_path))
+        return FileResponse(str(favicon_path), headers={"Cache-Control": STATIC_CACHE_CONTROL})
     return {"error": "Favicon not found"}
\ No newline at end of file
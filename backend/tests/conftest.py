@@ -0,0 +1,25 @@
+import os
+
+# GitHubStatsService reads the token at import; tests never call GitHub
+os.environ.setdefault("GITHUB_TOKEN", "test")
+os.environ.setdefault("ENVIRONMENT", "dev")
+
+import pytest
+import util.cache
+import util.db
+
+@pytest.fixture
+def mongo(monkeypatch):
+  """An empty in-memory database installed as util.db's client, with fresh service caches"""
+  pytest.importorskip("mongomock")
+  from benchmarks.stand_ins import StandInClient
+
+  client = StandInClient()
+  monkeypatch.setattr(util.db, "_client", client)
+  monkeypatch.setattr(util.cache, "service_cache", util.cache.TTLCache())
+  monkeypatch.setattr(util.cache, "stale_store", util.cache.StaleStore())
+  return client.client.get_database("portfolio")
+
+@pytest.fixture
+def anyio_backend():
+  return "asyncio"
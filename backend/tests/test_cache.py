@@ -0,0 +1,58 @@
+from util.cache import StaleStore, TTLCache
+from util.compression import CompressedBodyCache
+import asyncio
+
+def test_least_recently_used_entry_is_evicted():
+  cache = CompressedBodyCache(max_entries=2)
+  cache.set("a", b"1")
+  cache.set("b", b"2")
+  assert cache.get("a") == b"1"
+  cache.set("c", b"3")
+  assert cache.get("b") is None
+  assert cache.get("a") == b"1"
+  assert cache.stats() == {"entries": 2, "hits": 2, "misses": 1, "hitRatio": 0.6667}
+
+def test_ttl_cache_expires_and_invalidates_by_collection():
+  cache = TTLCache(ttl=60)
+  cache.set("roles", "roles", [1])
+  cache.set("projects", "projects", [2])
+  assert cache.get("roles") == (True, [1])
+  cache.invalidate("roles")
+  assert cache.get("roles") == (False, None)
+  assert cache.get("projects") == (True, [2])
+
+  expired = TTLCache(ttl=-1)
+  expired.set("roles", "roles", [1])
+  assert expired.get("roles") == (False, None)
+  assert expired.stats()["entries"] == 0
+
+def test_stale_store_recalls_within_max_age():
+  store = StaleStore(max_age=60)
+  store.remember("roles", [1])
+  found, value, age = store.recall("roles")
+  assert (found, value) == (True, [1])
+  assert 0 <= age < 1
+
+  too_old = StaleStore(max_age=-1)
+  too_old.remember("roles", [1])
+  assert too_old.recall("roles") == (False, None, 0.0)
+
+def test_prewarmed_entries_serve_the_routes(mongo):
+  from benchmarks.stand_ins import seed_portfolio
+  from fastapi.testclient import TestClient
+  from main import CACHE_WARMUPS, app
+  import util.cache
+  import util.db
+
+  seed_portfolio(util.db._client)
+
+  async def warm():
+    await asyncio.gather(*(warmup() for warmup in CACHE_WARMUPS))
+  asyncio.run(warm())
+
+  cache = util.cache.service_cache
+  misses = cache.misses
+  client = TestClient(app)
+  for path in ("/me", "/roles", "/projects", "/projects/entities", "/contact"):
+    assert client.get(path).status_code == 200
+  assert cache.misses == misses
@@ -0,0 +1,49 @@
+from starlette.responses import Response
+from util.compression import CompressedBodyCache, CompressionMiddleware, choose_encoding
+import httpx
+import pytest
+import util.compression
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+  ("gzip, deflate", "gzip"),
+  ("gzip;q=0", None),
+  ("identity", None),
+  ("*", util.compression.SUPPORTED_ENCODINGS[0]),
+])
+def test_choose_encoding(accept_encoding, expected):
+  assert choose_encoding(accept_encoding) == expected
+
+@pytest.mark.anyio
+async def test_compressed_bodies_are_cached_per_url(monkeypatch):
+  monkeypatch.setattr(util.compression, "compressed_body_cache", CompressedBodyCache())
+
+  async def app(scope, receive, send):
+    # Same ETag for every query string: it only has to be unique per URL
+    body = (scope["query_string"].decode() * 500).encode()
+    await Response(body, headers={"ETag": '"same"'})(scope, receive, send)
+
+  transport = httpx.ASGITransport(app=CompressionMiddleware(app))
+  async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+    for query in ("a=1", "b=2", "a=1"):
+      response = await client.get(f"/items?{query}", headers={"Accept-Encoding": "gzip"})
+      assert response.headers["content-encoding"] == "gzip"
+      assert response.headers["etag"] == 'W/"same"'
+      assert response.content == (query * 500).encode()
+
+  assert util.compression.compressed_body_cache.stats()["hits"] == 1
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("marker", [{"X-Stale-Age": "30"}, {"Cache-Control": "no-store"}])
+async def test_stale_and_no_store_bodies_are_not_cached(monkeypatch, marker):
+  monkeypatch.setattr(util.compression, "compressed_body_cache", CompressedBodyCache())
+  bodies = iter([(b"stale" * 500, marker), (b"fresh" * 500, {})])
+
+  async def app(scope, receive, send):
+    # The ETag comes from metadata, so it doesn't change when the body does
+    body, headers = next(bodies)
+    await Response(body, headers={"ETag": '"metadata"', **headers})(scope, receive, send)
+
+  transport = httpx.ASGITransport(app=CompressionMiddleware(app))
+  async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+    assert (await client.get("/github-stats", headers={"Accept-Encoding": "gzip"})).content == b"stale" * 500
+    assert (await client.get("/github-stats", headers={"Accept-Encoding": "gzip"})).content == b"fresh" * 500
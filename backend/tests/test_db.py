@@ -0,0 +1,39 @@
+from fastapi.testclient import TestClient
+from pymongo.errors import ConfigurationError
+import asyncio
+import threading
+import time
+import util.db
+
+def test_concurrent_callers_share_one_client_built_off_the_loop(monkeypatch):
+  created = []
+
+  def slow_client(*args, **kwargs):
+    # Stands in for the SRV lookup the real constructor does
+    time.sleep(0.05)
+    created.append(threading.current_thread())
+    return object()
+
+  monkeypatch.setattr(util.db, "_client", None)
+  monkeypatch.setattr(util.db, "AsyncMongoClient", slow_client)
+
+  async def race():
+    return await asyncio.gather(*(util.db.ensure_client() for _ in range(5)))
+
+  clients = asyncio.run(race())
+  assert len(created) == 1
+  assert created[0] is not threading.main_thread()
+  assert all(client is clients[0] for client in clients)
+
+def test_unresolvable_cluster_is_a_503(monkeypatch):
+  from main import app
+
+  def unresolvable(*args, **kwargs):
+    raise ConfigurationError("The DNS query name does not exist: _mongodb._tcp.nonexistent-zz.mongodb.net.")
+
+  monkeypatch.setattr(util.db, "_client", None)
+  monkeypatch.setattr(util.db, "AsyncMongoClient", unresolvable)
+  client = TestClient(app)
+  for path in ("/projects", "/roles", "/me", "/bootstrap", "/github-stats"):
+    assert client.get(path).status_code == 503
+  assert client.get("/health").status_code == 200
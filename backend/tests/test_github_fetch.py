@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta
+from lib.github_stats_service import GitHubStatsService
+import pytest
+
+@pytest.fixture
+def service(mongo):
+  return GitHubStatsService()
+
+def covered_days(chunks):
+  return [
+    (chunk_from + timedelta(days=offset)).date()
+    for chunk_from, chunk_to in chunks
+    for offset in range((chunk_to.date() - chunk_from.date()).days + 1)
+  ]
+
+@pytest.mark.parametrize("from_date, to_date", [
+  (datetime(2026, 10, 18), datetime(2026, 10, 18)),
+  (datetime(2025, 1, 1), datetime(2025, 12, 31)),
+  (datetime(2024, 1, 1), datetime(2024, 12, 31)),
+  (datetime(2015, 1, 1), datetime(2026, 10, 18, 13, 45)),
+  (datetime(2019, 7, 4, 9, 30), datetime(2021, 2, 28)),
+])
+def test_split_date_range_covers_every_day_once(service, from_date, to_date):
+  chunks = service.split_date_range(from_date, to_date)
+
+  days = covered_days(chunks)
+  assert days[0] == from_date.date()
+  assert days[-1] == to_date.date()
+  assert days == sorted(set(days))
+  assert len(days) == (to_date.date() - from_date.date()).days + 1
+  # GitHub rejects contributionsCollection ranges longer than a year
+  assert all(chunk_to - chunk_from <= timedelta(days=364) for chunk_from, chunk_to in chunks)
+
+def test_split_date_range_leap_year_takes_two_chunks(service):
+  chunks = service.split_date_range(datetime(2024, 1, 1), datetime(2024, 12, 31))
+  assert chunks == [
+    (datetime(2024, 1, 1), datetime(2024, 12, 30)),
+    (datetime(2024, 12, 31), datetime(2024, 12, 31)),
+  ]
+
+def test_split_date_range_empty_when_reversed(service):
+  assert service.split_date_range(datetime(2026, 1, 2), datetime(2026, 1, 1)) == []
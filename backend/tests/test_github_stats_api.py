@@ -0,0 +1,28 @@
+from fastapi.testclient import TestClient
+from lib.github_stats_service import GitHubStatsService
+import pytest
+
+@pytest.fixture
+def client(mongo):
+  from main import app
+
+  service = GitHubStatsService()
+  for year in ("2024", "2025"):
+    start, counts = service.encode_contributions([
+      {"date": f"{year}-{month:02d}-01", "count": month} for month in range(1, 13)
+    ])
+    mongo.github_stats.insert_one(service.build_year_doc(year, start, counts, "2025-12-02T00:00:00Z", "octocat"))
+  return TestClient(app)
+
+def test_year_narrows_a_window_that_extends_past_it(client):
+  response = client.get("/github-stats?year=2025&from=2024-11-01&to=2026-02-01&granularity=month")
+  assert response.status_code == 200
+  body = response.json()
+  assert body["fromDate"] == "2025-01-01"
+  assert body["toDate"] == "2025-12-31"
+  assert [item["date"][:4] for item in body["contributions"]] == ["2025"] * 12
+  assert body["totalContributions"] == sum(range(1, 13))
+
+def test_year_and_window_that_dont_overlap_are_rejected(client):
+  response = client.get("/github-stats?year=2025&from=2024-01-01&to=2024-02-01")
+  assert response.status_code == 400
@@ -0,0 +1,93 @@
+from array import array
+from lib.github_stats_service import COUNTS_TYPECODE, GitHubStatsService
+from datetime import date
+import asyncio
+import pytest
+
+def days(start_day: int, counts):
+  return [{"date": f"2026-10-{start_day + offset:02d}", "count": count} for offset, count in enumerate(counts)]
+
+@pytest.fixture
+def service(mongo):
+  return GitHubStatsService()
+
+def stored_year(mongo, service, year="2026"):
+  doc = mongo.github_stats.find_one({"_id": year})
+  return doc, service.decode_stored_contributions(doc)
+
+def test_merge_counts_overwrites_overlap_and_fills_gaps(service):
+  existing = array(COUNTS_TYPECODE, [1, 2, 3])
+  start, merged = service.merge_counts("2026-10-10", existing, "2026-10-12", array(COUNTS_TYPECODE, [7, 8]))
+  assert start == "2026-10-10"
+  assert list(merged) == [1, 2, 7, 8]
+
+  start, merged = service.merge_counts("2026-10-10", existing, "2026-10-05", array(COUNTS_TYPECODE, [4]))
+  assert start == "2026-10-05"
+  assert list(merged) == [4, 0, 0, 0, 0, 1, 2, 3]
+
+def test_set_day_counts_keeps_days_between_changes(service):
+  counts = array(COUNTS_TYPECODE, [5, 5, 5, 5, 5])
+  start, merged = service.set_day_counts("2026-10-10", counts, [
+    {"date": "2026-10-11", "count": 9},
+    {"date": "2026-10-13", "count": 9},
+  ])
+  assert start == "2026-10-10"
+  assert list(merged) == [5, 9, 5, 9, 5]
+  assert list(counts) == [5, 5, 5, 5, 5]
+
+def test_set_day_counts_widens_the_range(service):
+  start, merged = service.set_day_counts("2026-10-10", array(COUNTS_TYPECODE, [5, 5]), [
+    {"date": "2026-10-08", "count": 1},
+    {"date": "2026-10-13", "count": 2},
+  ])
+  assert start == "2026-10-08"
+  assert list(merged) == [1, 0, 5, 5, 0, 2]
+
+def test_apply_year_deltas_non_contiguous_changes_keep_stored_days(mongo, service, monkeypatch):
+  monkeypatch.setattr("lib.github_stats_service.STORAGE_FORMAT", "compact")
+  start, counts = service.encode_contributions(days(10, [5, 5, 5, 5, 5]))
+  mongo.github_stats.insert_one(service.build_year_doc("2026", start, counts, "2026-10-14T00:00:00Z", "octocat"))
+
+  # A revised earlier day plus a new "today", with unchanged days in between
+  fetched = days(10, [5, 9, 5, 5, 5, 8])
+  results = asyncio.run(service.apply_year_deltas({"2026": fetched}, "octocat", "2026-10-15T00:00:00Z"))
+
+  doc, contributions = stored_year(mongo, service)
+  assert contributions == fetched
+  assert doc["totalContributions"] == sum(item["count"] for item in fetched) == 37
+  assert results[0]["changedDays"] == 2
+  assert results[0]["storedTotal"] == 37
+
+@pytest.mark.parametrize("storage_format", ["compact", "documents"])
+def test_apply_year_deltas_matches_a_full_merge(mongo, service, monkeypatch, storage_format):
+  monkeypatch.setattr("lib.github_stats_service.STORAGE_FORMAT", storage_format)
+  stored = days(1, [3, 0, 4, 1, 0, 2, 6, 0, 0, 5])
+  start, counts = service.encode_contributions(stored)
+  mongo.github_stats.insert_one(service.build_year_doc("2026", start, counts, "2026-10-10T00:00:00Z", "octocat"))
+
+  fetched = days(3, [4, 2, 0, 2, 1, 0, 0, 5, 7, 3])
+  asyncio.run(service.apply_year_deltas({"2026": fetched}, "octocat", "2026-10-12T00:00:00Z"))
+
+  doc, contributions = stored_year(mongo, service)
+  expected = service.merge_contributions(stored, fetched)
+  assert contributions == expected
+  assert doc["totalContributions"] == sum(item["count"] for item in expected)
+
+@pytest.mark.parametrize("from_day, to_day", [
+  ("2025-01-01", "2025-01-15"),
+  ("2025-08-01", "2025-08-31"),
+])
+@pytest.mark.parametrize("granularity", ["day", "week"])
+def test_contribution_series_window_outside_stored_days_is_empty(mongo, service, from_day, to_day, granularity):
+  # A partial year: stored days run from February through June
+  start, counts = service.encode_contributions([
+    {"date": "2025-02-01", "count": 3},
+    {"date": "2025-06-30", "count": 5},
+  ])
+  mongo.github_stats.insert_one(service.build_year_doc("2025", start, counts, "2025-07-01T00:00:00Z", "octocat"))
+
+  series = asyncio.run(service.get_contribution_series(
+    date.fromisoformat(from_day), date.fromisoformat(to_day), granularity
+  ))
+  assert series["contributions"] == []
+  assert series["totalContributions"] == 0
@@ -0,0 +1,27 @@
+from lib.github_stats_service import GitHubStatsService
+from lib.ingest_job_service import IngestJobService, cancel_ingest_jobs
+import asyncio
+import pytest
+
+@pytest.mark.parametrize("started", [True, False])
+def test_cancelled_job_frees_the_ingest_slot(mongo, monkeypatch, started):
+  async def never_finishes(self, **params):
+    await asyncio.Event().wait()
+
+  monkeypatch.setattr(GitHubStatsService, "ingest_contributions", never_finishes)
+  service = IngestJobService()
+
+  async def run():
+    job = service.start_job({})
+    if started:
+      await asyncio.sleep(0)
+    assert service.get_active_job() is job
+    await cancel_ingest_jobs()
+    with pytest.raises(asyncio.CancelledError):
+      await job.task
+    return job
+
+  job = asyncio.run(run())
+  assert job.status == "cancelled"
+  assert job.events[-1]["event"] == "cancelled"
+  assert service.get_active_job() is None
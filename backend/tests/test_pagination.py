@@ -0,0 +1,73 @@
+from bson import ObjectId
+from fastapi.testclient import TestClient
+from lib.roles_service import RolesService
+from util.pagination import decode_cursor, encode_cursor
+import asyncio
+import pytest
+
+def test_cursor_round_trips_sort_values():
+  role_id = ObjectId()
+  cursor = encode_cursor(["2024-01-01", role_id])
+  assert "=" not in cursor
+  assert decode_cursor(cursor) == ["2024-01-01", str(role_id)]
+
+@pytest.mark.parametrize("cursor", ["not a cursor", "e30", "bnVsbA"])
+def test_decode_cursor_rejects_foreign_values(cursor):
+  # "e30" and "bnVsbA" are base64 for {} and null: valid JSON, but not sort values
+  with pytest.raises(ValueError):
+    decode_cursor(cursor)
+
+def page_through(limit):
+  service = RolesService()
+  titles, after = [], None
+  while True:
+    roles = asyncio.run(service.get_roles(limit=limit, after=after))
+    page = roles[:limit]
+    titles.extend(role["title"] for role in page)
+    if len(roles) <= limit:
+      return titles
+    after = encode_cursor(RolesService.page_cursor(page[-1]))
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 10])
+def test_roles_keyset_pages_cover_ties_once(mongo, limit):
+  # Three roles share a start date, so pages split inside the tie and rely on _id
+  start_dates = ["2020-01-01", "2022-06-01", "2022-06-01", "2022-06-01", "2019-03-01", "2024-02-01"]
+  mongo.roles.insert_many([
+    {"_id": ObjectId(f"{index:024x}"), "title": f"Role {index}", "startDate": start_date}
+    for index, start_date in enumerate(start_dates)
+  ])
+
+  assert page_through(limit) == ["Role 5", "Role 3", "Role 2", "Role 1", "Role 0", "Role 4"]
+
+@pytest.mark.parametrize("limit", [1, 2, 4])
+def test_roles_without_start_date_page_last(mongo, limit):
+  mongo.roles.insert_many([
+    {"_id": ObjectId(f"{1:024x}"), "title": "Role 1", "startDate": "2020-01-01"},
+    {"_id": ObjectId(f"{2:024x}"), "title": "Role 2"},
+    {"_id": ObjectId(f"{3:024x}"), "title": "Role 3", "startDate": "2022-01-01"},
+    {"_id": ObjectId(f"{4:024x}"), "title": "Role 4", "startDate": None},
+  ])
+
+  assert page_through(limit) == ["Role 3", "Role 1", "Role 4", "Role 2"]
+
+def test_roles_rejects_malformed_cursor(mongo):
+  with pytest.raises(ValueError):
+    asyncio.run(RolesService().get_roles(limit=2, after=encode_cursor(["2022-06-01", "not-an-id"])))
+
+def test_roles_etag_follows_the_returned_page(mongo):
+  from main import app
+
+  mongo.roles.insert_many([
+    {"title": f"Role {index}", "startDate": f"202{index}-01-01", "description": ["Built things"]}
+    for index in range(3)
+  ])
+  client = TestClient(app)
+  etags = {
+    params: client.get(f"/roles?{params}").headers["etag"]
+    for params in ("fields=description", "fields=description,startDate", "limit=1", "limit=2")
+  }
+  assert len(set(etags.values())) == len(etags)
+
+  response = client.get("/roles?fields=description,startDate", headers={"If-None-Match": etags["fields=description"]})
+  assert response.status_code == 200
+  assert set(response.json()[0]) == {"description", "startDate"}
@@ -0,0 +1,46 @@
+from benchmarks.stand_ins import StandInCollection, StandInCursor
+from fastapi.testclient import TestClient
+from lib.github_stats_service import GitHubStatsService
+from pymongo.errors import ServerSelectionTimeoutError
+import pytest
+import util.cache
+
+@pytest.fixture
+def client(mongo):
+  from main import app
+
+  service = GitHubStatsService()
+  for year in ("2024", "2025"):
+    start, counts = service.encode_contributions([{"date": f"{year}-03-01", "count": 4}])
+    mongo.github_stats.insert_one(service.build_year_doc(year, start, counts, "2025-03-02T00:00:00Z", "octocat"))
+  mongo.roles.insert_one({"title": "Role", "startDate": "2025-01-01"})
+  return TestClient(app)
+
+def take_database_down(monkeypatch):
+  async def down(*args, **kwargs):
+    raise ServerSelectionTimeoutError("No servers available")
+
+  monkeypatch.setattr(StandInCursor, "to_list", down)
+  monkeypatch.setattr(StandInCollection, "__getattr__", lambda self, name: down)
+  util.cache.service_cache.invalidate()
+
+def test_outage_serves_last_good_result_marked_stale(client, monkeypatch):
+  fresh = client.get("/roles")
+  assert "x-stale-age" not in fresh.headers
+
+  take_database_down(monkeypatch)
+  stale = client.get("/roles")
+  assert stale.status_code == 200
+  assert stale.json() == fresh.json()
+  assert stale.headers["x-stale-age"] == "0"
+  assert stale.headers["cache-control"] == "no-store"
+
+def test_errors_are_not_marked_stale(client, monkeypatch):
+  assert client.get("/github-stats?year=2025").status_code == 200
+
+  take_database_down(monkeypatch)
+  # The ingest metadata comes from the stale store, but 2024's stats were never read
+  response = client.get("/github-stats?year=2024")
+  assert response.status_code == 503
+  assert "x-stale-age" not in response.headers
+  assert util.cache.stale_store.stats()["hits"] >= 1
@@ -0,0 +1,209 @@
+from collections import OrderedDict
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+import inspect
+import os
+import time
+from dotenv import load_dotenv
+from pymongo.errors import PyMongoError
+
+load_dotenv()
+
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", "300"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "256"))
+
+# How old a last-known-good result may be and still be served when MongoDB fails
+STALE_IF_ERROR_SECONDS = float(os.getenv("STALE_IF_ERROR_SECONDS", "86400"))
+STALE_MAX_ENTRIES = int(os.getenv("STALE_MAX_ENTRIES", "256"))
+# After a failure, serve stale results without retrying that collection for this long
+STALE_RETRY_SECONDS = float(os.getenv("STALE_RETRY_SECONDS", "10"))
+
+class LRUStore:
+  """Size-bounded LRU of entries, counting hits and misses for stats()"""
+
+  def __init__(self, max_entries: int):
+    self.max_entries = max_entries
+    self.hits = 0
+    self.misses = 0
+    self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+  def lookup(self, key: Hashable, is_valid: Optional[Callable[[Any], bool]] = None) -> Optional[Any]:
+    """Return the entry for key, or None; entries failing is_valid are dropped"""
+    entry = self._entries.get(key)
+    if entry is not None and is_valid is not None and not is_valid(entry):
+      del self._entries[key]
+      entry = None
+    if entry is None:
+      self.misses += 1
+      return None
+    self._entries.move_to_end(key)
+    self.hits += 1
+    return entry
+
+  def put(self, key: Hashable, entry: Any):
+    self._entries[key] = entry
+    self._entries.move_to_end(key)
+    while len(self._entries) > self.max_entries:
+      self._entries.popitem(last=False)
+
+  def stats(self) -> Dict:
+    lookups = self.hits + self.misses
+    return {
+      "entries": len(self._entries),
+      "hits": self.hits,
+      "misses": self.misses,
+      "hitRatio": round(self.hits / lookups, 4) if lookups else 0.0,
+    }
+
+class TTLCache(LRUStore):
+  """LRU cache whose entries expire after a fixed TTL"""
+
+  def __init__(self, ttl: float = CACHE_TTL_SECONDS, max_entries: int = CACHE_MAX_ENTRIES):
+    super().__init__(max_entries)
+    self.ttl = ttl
+
+  def get(self, key: Hashable) -> tuple[bool, Any]:
+    # Entries are (expires_at, collection_name, value)
+    entry = self.lookup(key, lambda entry: entry[0] >= time.monotonic())
+    return (False, None) if entry is None else (True, entry[2])
+
+  def set(self, key: Hashable, collection_name: str, value: Any):
+    self.put(key, (time.monotonic() + self.ttl, collection_name, value))
+
+  def invalidate(self, collection_name: Optional[str] = None):
+    """Drop every entry read from collection_name, or everything if no collection is given"""
+    if collection_name is None:
+      self._entries.clear()
+      return
+    for key in [key for key, entry in self._entries.items() if entry[1] == collection_name]:
+      del self._entries[key]
+
+class StaleStore(LRUStore):
+  """Last successful result per query, kept to answer while MongoDB is failing
+
+  Unlike TTLCache entries these don't expire or get invalidated by writes; they are
+  only served after a read fails, for up to STALE_IF_ERROR_SECONDS.
+  """
+
+  def __init__(self, max_age: float = STALE_IF_ERROR_SECONDS, max_entries: int = STALE_MAX_ENTRIES):
+    super().__init__(max_entries)
+    self.max_age = max_age
+    self._failing_until: Dict[str, float] = {}
+
+  def remember(self, key: Hashable, value: Any):
+    self.put(key, (time.monotonic(), value))
+
+  def recall(self, key: Hashable) -> tuple[bool, Any, float]:
+    """Return (found, value, age in seconds) for the last good result of key"""
+    now = time.monotonic()
+    entry = self.lookup(key, lambda entry: now - entry[0] <= self.max_age)
+    if entry is None:
+      return False, None, 0.0
+    return True, entry[1], now - entry[0]
+
+  def is_failing(self, collection_name: str) -> bool:
+    return self._failing_until.get(collection_name, 0.0) > time.monotonic()
+
+  def mark_failed(self, collection_name: str):
+    self._failing_until[collection_name] = time.monotonic() + STALE_RETRY_SECONDS
+
+  def mark_recovered(self, collection_name: str):
+    self._failing_until.pop(collection_name, None)
+
+# Shared cache for service reads
+service_cache = TTLCache()
+stale_store = StaleStore()
+
+# Ages in seconds of stale results served during the current request, collected by
+# StaleResponseMiddleware (None outside a request)
+stale_age: ContextVar[Optional[list]] = ContextVar("stale_age", default=None)
+
+def note_stale_read(age: float):
+  ages = stale_age.get()
+  if ages is not None:
+    ages.append(age)
+
+async def read_with_stale_fallback(key: Hashable, collection_name: str, read: Callable[[], Awaitable]) -> tuple[Any, bool]:
+  """Run read, falling back to its last good result if MongoDB fails
+
+  While a collection is failing, reads with a stored result skip the database for
+  STALE_RETRY_SECONDS rather than each waiting out a server selection timeout.
+  Returns (value, stale). Errors with no stored result are raised.
+  """
+  if stale_store.is_failing(collection_name):
+    found, value, age = stale_store.recall(key)
+    if found:
+      note_stale_read(age)
+      return value, True
+
+  try:
+    value = await read()
+  except PyMongoError as e:
+    stale_store.mark_failed(collection_name)
+    found, value, age = stale_store.recall(key)
+    if not found:
+      raise
+    print(f"MongoDB error reading {collection_name}, serving data from {age:.0f}s ago: {str(e)}")
+    note_stale_read(age)
+    return value, True
+
+  stale_store.mark_recovered(collection_name)
+  stale_store.remember(key, value)
+  return value, False
+
+def key_builder(func: Callable) -> Callable[[Any, tuple, Dict], Hashable]:
+  """Cache keys for calls to a service method, with arguments bound to its parameters
+
+  Defaults are filled in, so get_roles() and get_roles(limit=None) share an entry.
+  """
+  signature = inspect.signature(func)
+
+  def cache_key(self: Any, args: tuple, kwargs: Dict) -> Hashable:
+    bound = signature.bind(self, *args, **kwargs)
+    bound.apply_defaults()
+    return (func.__qualname__, tuple(bound.arguments.values())[1:])
+  return cache_key
+
+def cached(collection_name: str) -> Callable:
+  """Read-through cache for async service methods that read from collection_name
+
+  Misses go through read_with_stale_fallback, so a MongoDB failure serves the last
+  good result instead. Stale results are not put back in the cache.
+  """
+  def decorator(func: Callable) -> Callable:
+    cache_key = key_builder(func)
+
+    @wraps(func)
+    async def wrapper(self, *args, **kwargs):
+      key = cache_key(self, args, kwargs)
+      found, value = service_cache.get(key)
+      if found:
+        return value
+      value, stale = await read_with_stale_fallback(key, collection_name, lambda: func(self, *args, **kwargs))
+      if not stale:
+        service_cache.set(key, collection_name, value)
+      return value
+    return wrapper
+  return decorator
+
+def stale_if_error(collection_name: str) -> Callable:
+  """Serve the last good result of an async service method when MongoDB fails, without caching"""
+  def decorator(func: Callable) -> Callable:
+    cache_key = key_builder(func)
+
+    @wraps(func)
+    async def wrapper(self, *args, **kwargs):
+      value, _ = await read_with_stale_fallback(cache_key(self, args, kwargs), collection_name, lambda: func(self, *args, **kwargs))
+      return value
+    return wrapper
+  return decorator
+
+def invalidate(collection_name: Optional[str] = None):
+  service_cache.invalidate(collection_name)
+
+def get_cache_stats() -> Dict:
+  return service_cache.stats()
+
+def get_stale_stats() -> Dict:
+  return stale_store.stats()
@@ -0,0 +1,159 @@
+from typing import Dict, List, Optional, Tuple
+import gzip
+import importlib
+import importlib.util
+import os
+from dotenv import load_dotenv
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from util.cache import LRUStore
+
+load_dotenv()
+
+# Responses smaller than this are sent as they are
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+# Compressed bodies of responses with an ETag, kept so a payload is only compressed once
+COMPRESSION_CACHE_MAX_ENTRIES = int(os.getenv("COMPRESSION_CACHE_MAX_ENTRIES", "64"))
+
+# Brotli needs the optional brotli package (pip install brotli), otherwise only gzip is offered
+brotli = importlib.import_module("brotli") if importlib.util.find_spec("brotli") else None
+
+SUPPORTED_ENCODINGS = ["br", "gzip"] if brotli else ["gzip"]
+
+# Event streams are flushed as they are written, so they are never buffered for compression
+UNCOMPRESSED_MEDIA_TYPES = ("text/event-stream", "image/", "font/woff", "application/zip", "application/gzip")
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+  """Pick the preferred supported encoding from an Accept-Encoding header"""
+  weights: Dict[str, float] = {}
+  for part in accept_encoding.split(","):
+    coding, _, params = part.strip().partition(";")
+    coding = coding.strip().lower()
+    if not coding:
+      continue
+    weight = 1.0
+    params = params.strip()
+    if params.startswith("q="):
+      try:
+        weight = float(params[2:])
+      except ValueError:
+        weight = 0.0
+    weights[coding] = weight
+
+  candidates = [
+    (weights.get(encoding, weights.get("*", 0.0)), -rank, encoding)
+    for rank, encoding in enumerate(SUPPORTED_ENCODINGS)
+  ]
+  weight, _, encoding = max(candidates)
+  return encoding if weight > 0 else None
+
+def compress(body: bytes, encoding: str) -> bytes:
+  if encoding == "br":
+    return brotli.compress(body, quality=COMPRESSION_BROTLI_QUALITY)
+  # A fixed mtime keeps the output identical for identical bodies
+  return gzip.compress(body, compresslevel=COMPRESSION_GZIP_LEVEL, mtime=0)
+
+class CompressedBodyCache(LRUStore):
+  """LRU of compressed bodies keyed by path and query string, ETag and encoding"""
+
+  def __init__(self, max_entries: int = COMPRESSION_CACHE_MAX_ENTRIES):
+    super().__init__(max_entries)
+
+  def get(self, key: Tuple[str, bytes, str, str]) -> Optional[bytes]:
+    return self.lookup(key)
+
+  def set(self, key: Tuple[str, bytes, str, str], body: bytes):
+    self.put(key, body)
+
+compressed_body_cache = CompressedBodyCache()
+
+def get_compression_stats() -> Dict:
+  return compressed_body_cache.stats()
+
+class CompressionMiddleware:
+  """Negotiate gzip or brotli for complete responses above COMPRESSION_MIN_SIZE
+
+  Streaming responses (NDJSON, SSE) pass through untouched. When the response carries
+  an ETag its compressed body is cached, so repeated requests for an unchanged payload
+  skip compression entirely.
+  """
+
+  def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_SIZE):
+    self.app = app
+    self.minimum_size = minimum_size
+
+  async def __call__(self, scope: Scope, receive: Receive, send: Send):
+    if scope["type"] != "http":
+      await self.app(scope, receive, send)
+      return
+
+    encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+    if encoding is None:
+      await self.app(scope, receive, send)
+      return
+
+    start_message: Optional[Message] = None
+    body_parts: List[bytes] = []
+    passthrough = False
+
+    async def send_compressed(message: Message):
+      nonlocal start_message, passthrough
+      if passthrough:
+        await send(message)
+        return
+
+      if message["type"] == "http.response.start":
+        headers = Headers(raw=message["headers"])
+        media_type = headers.get("content-type", "")
+        if "content-encoding" in headers or media_type.startswith(UNCOMPRESSED_MEDIA_TYPES):
+          passthrough = True
+          await send(message)
+        else:
+          start_message = message
+        return
+
+      if message["type"] != "http.response.body":
+        await send(message)
+        return
+
+      body_parts.append(message.get("body", b""))
+      if message.get("more_body", False):
+        # Streamed bodies go out as they are produced
+        passthrough = True
+        await send(start_message)
+        await send({"type": "http.response.body", "body": b"".join(body_parts), "more_body": True})
+        return
+
+      await self.send_response(scope, send, start_message, b"".join(body_parts), encoding)
+
+    await self.app(scope, receive, send_compressed)
+
+  async def send_response(self, scope: Scope, send: Send, start_message: Message, body: bytes, encoding: str):
+    headers = MutableHeaders(raw=start_message["headers"])
+    if len(body) < self.minimum_size or start_message["status"] in (204, 304):
+      await send(start_message)
+      await send({"type": "http.response.body", "body": body})
+      return
+
+    etag = headers.get("etag")
+    # An ETag only identifies a representation of one URL, query string included.
+    # Some ETags come from metadata rather than the body, so stale and no-store
+    # bodies are never cached: they would outlive the outage under a current ETag.
+    cacheable = etag and "x-stale-age" not in headers and "no-store" not in headers.get("cache-control", "")
+    key = (scope["path"], scope["query_string"], etag, encoding)
+    compressed = compressed_body_cache.get(key) if cacheable else None
+    if compressed is None:
+      compressed = compress(body, encoding)
+      if cacheable:
+        compressed_body_cache.set(key, compressed)
+
+    headers["Content-Encoding"] = encoding
+    headers["Content-Length"] = str(len(compressed))
+    headers.add_vary_header("Accept-Encoding")
+    if etag and not etag.startswith("W/"):
+      # The compressed bytes differ from the identity representation the strong ETag names
+      headers["ETag"] = f"W/{etag}"
+    await send(start_message)
+    await send({"type": "http.response.body", "body": compressed})
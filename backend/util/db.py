@@ -1,8 +1,15 @@
 from dotenv import load_dotenv
-from pymongo.mongo_client import MongoClient
+from fastapi import HTTPException, status
+from pymongo import AsyncMongoClient
 from pymongo.server_api import ServerApi
-from bson import ObjectId
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+import util.cache
+from util.metrics import MongoCommandMetrics
+import asyncio
 import os
+import threading
+import time
 load_dotenv()
 
 MONGODB_USER = os.getenv("MONGODB_USER")
@@ -10,6 +17,8 @@ MONGODB_PASS = os.getenv("MONGODB_PASS")
 MONGODB_CLUSTER = os.getenv("MONGODB_CLUSTER")
 MONGODB_APPNAME = os.getenv("MONGODB_APPNAME")
 ENVIRONMENT = os.getenv("ENVIRONMENT", "dev").lower()
+# How long a query waits for a reachable server before failing (the driver default is 30s)
+MONGODB_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "5000"))
 
 uri = f"mongodb+srv://{MONGODB_USER}:{MONGODB_PASS}@{MONGODB_CLUSTER}.mongodb.net/?appName={MONGODB_APPNAME}"
 
@@ -19,45 +28,113 @@ uri = f"mongodb+srv://{MONGODB_USER}:{MONGODB_PASS}@{MONGODB_CLUSTER}.mongodb.ne
 # Note: tlsAllowInvalidCertificates=True should only be used in development
 # For production, ensure proper SSL certificates are configured
 
-# Create a new client and connect to the server
-# tlsAllowInvalidCertificates is set to True only in dev environment to handle SSL certificate issues
-client = MongoClient(uri, server_api=ServerApi('1'), tlsAllowInvalidCertificates=(ENVIRONMENT == "dev"))
+# Async client so queries don't block the event loop
+# Created on first use, so importing the routers doesn't resolve the cluster's SRV record
+_client = None
+# Only one client is ever created, even when startup and requests race to create it
+_client_lock = threading.Lock()
 
-# Get the database
-db = client.get_database("portfolio")
+def get_client() -> AsyncMongoClient:
+  """The shared client, created on first use
+
+  Creating it resolves the SRV record and blocks, so async code awaits ensure_client
+  first; service constructors then find the client already there.
+  """
+  global _client
+  if _client is None:
+    with _client_lock:
+      if _client is None:
+        # tlsAllowInvalidCertificates is set to True only in dev environment to handle SSL certificate issues
+        # The command listener feeds per-collection timings and errors to /metrics
+        _client = AsyncMongoClient(
+          uri,
+          server_api=ServerApi('1'),
+          tlsAllowInvalidCertificates=(ENVIRONMENT == "dev"),
+          event_listeners=[MongoCommandMetrics()],
+          serverSelectionTimeoutMS=MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+        )
+  return _client
+
+async def ensure_client() -> AsyncMongoClient:
+  """The shared client, created in a worker thread if it doesn't exist yet"""
+  if _client is not None:
+    return _client
+  return await asyncio.to_thread(get_client)
+
+async def require_client():
+  """Dependency for routers that read MongoDB
+
+  Makes sure the client exists before the route builds its services, so the event
+  loop never blocks on the SRV lookup. A client that can't be created, like one for
+  an unresolvable cluster, is a 503.
+  """
+  try:
+    await ensure_client()
+  except Exception as e:
+    print(f"MongoDB client error: {str(e)}")
+    raise HTTPException(
+      status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+      detail="Service temporarily unavailable. Please try again later."
+    )
+
+async def connect():
+  """Create the client off the event loop and open its pool"""
+  client = await ensure_client()
+  await client.aconnect()
+
+async def close_client():
+  global _client
+  if _client is not None:
+    await _client.close()
+    _client = None
+
+# Readiness pings are cached so frequent probes don't each hit the cluster
+READY_PING_TTL_SECONDS = float(os.getenv("READY_PING_TTL_SECONDS", "5"))
+READY_PING_TIMEOUT_SECONDS = float(os.getenv("READY_PING_TIMEOUT_SECONDS", "2"))
+
+# Last ping as (expires_at, result)
+_last_ping: Optional[Tuple[float, Dict]] = None
+
+async def ping_database() -> Dict:
+  """Round trip a ping to the cluster, reusing the result for READY_PING_TTL_SECONDS"""
+  global _last_ping
+  if _last_ping and _last_ping[0] > time.monotonic():
+    return _last_ping[1]
+
+  async def ping():
+    client = await ensure_client()
+    await client.admin.command("ping")
+
+  started = time.perf_counter()
+  try:
+    await asyncio.wait_for(ping(), READY_PING_TIMEOUT_SECONDS)
+    result = {"ok": True, "latencyMs": round((time.perf_counter() - started) * 1000, 2), "error": None}
+  except asyncio.TimeoutError:
+    result = {"ok": False, "latencyMs": None, "error": f"Ping timed out after {READY_PING_TIMEOUT_SECONDS}s"}
+  except Exception as e:
+    result = {"ok": False, "latencyMs": None, "error": str(e)}
+  result["checkedAt"] = datetime.utcnow().isoformat() + "Z"
+  _last_ping = (time.monotonic() + READY_PING_TTL_SECONDS, result)
+  return result
+
+def get_database():
+  return get_client().get_database("portfolio")
 
 def get_collection(collection_name: str):
-  return db.get_collection(collection_name)
-
-def get_document(collection_name: str, document_id: str):
-  return get_collection(collection_name).find_one({"_id": document_id})
-
-def get_documents(collection_name: str):
-  return get_collection(collection_name).find()
-
-def insert_document(collection_name: str, document: dict):
-  return get_collection(collection_name).insert_one(document)
-
-def update_document(collection_name: str, document_id: str, document: dict):
-  return get_collection(collection_name).update_one({"_id": document_id}, {"$set": document})
-
-def convert_objectid_to_str(document):
-  """Convert ObjectId fields to strings for JSON serialization"""
-  if document is None:
-    return None
-  if isinstance(document, dict):
-    result = {}
-    for key, value in document.items():
-      if isinstance(value, ObjectId):
-        result[key] = str(value)
-      elif isinstance(value, dict):
-        result[key] = convert_objectid_to_str(value)
-      elif isinstance(value, list):
-        result[key] = [convert_objectid_to_str(item) for item in value]
-      else:
-        result[key] = value
-    return result
-  elif isinstance(document, list):
-    return [convert_objectid_to_str(item) for item in document]
-  else:
-    return document
\ No newline at end of file
+  return get_database().get_collection(collection_name)
+
+async def get_document(collection_name: str, document_id: str):
+  return await get_collection(collection_name).find_one({"_id": document_id})
+
+async def get_documents(collection_name: str):
+  return await get_collection(collection_name).find().to_list(None)
+
+async def insert_document(collection_name: str, document: dict):
+  result = await get_collection(collection_name).insert_one(document)
+  util.cache.invalidate(collection_name)
+  return result
+
+async def update_document(collection_name: str, document_id: str, document: dict):
+  result = await get_collection(collection_name).update_one({"_id": document_id}, {"$set": document})
+  util.cache.invalidate(collection_name)
+  return result
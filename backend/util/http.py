@@ -0,0 +1,135 @@
+from fastapi import Request, Response
+from fastapi.staticfiles import StaticFiles
+from pydantic import BaseModel
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from util.cache import stale_age
+from typing import Any, Optional, Sequence, Type
+import hashlib
+import orjson
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DEFAULT_CACHE_CONTROL = os.getenv("CACHE_CONTROL_DEFAULT", "public, max-age=300, must-revalidate")
+# Public assets (favicon, /static) only change with a deploy
+STATIC_CACHE_CONTROL = os.getenv("CACHE_CONTROL_STATIC", "public, max-age=31536000, immutable")
+
+def get_cache_control(route_name: str) -> str:
+  """Cache-Control for a route, overridable with CACHE_CONTROL_<ROUTE_NAME> (e.g. CACHE_CONTROL_GITHUB_STATS)"""
+  return os.getenv(f"CACHE_CONTROL_{route_name.upper()}", DEFAULT_CACHE_CONTROL)
+
+def etag_for_content(content: bytes) -> str:
+  """Strong ETag for a response body"""
+  return f'"{hashlib.sha256(content).hexdigest()[:32]}"'
+
+def compute_etag(data: Any) -> str:
+  """Strong ETag derived from the JSON form of the underlying documents"""
+  return etag_for_content(orjson.dumps(data, default=str, option=orjson.OPT_SORT_KEYS))
+
+def etag_matches(request: Request, etag: str) -> bool:
+  if_none_match = request.headers.get("if-none-match")
+  if not if_none_match:
+    return False
+  if if_none_match.strip() == "*":
+    return True
+  # Weak comparison is allowed for If-None-Match, so ignore any W/ prefix
+  candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+  return etag in candidates
+
+def conditional_response(request: Request, response: Response, etag: str, route_name: str) -> Optional[Response]:
+  """Set validator headers on the response, returning a 304 response if the client copy is current"""
+  headers = {
+    "ETag": etag,
+    "Cache-Control": get_cache_control(route_name),
+  }
+  if etag_matches(request, etag):
+    return Response(status_code=304, headers=headers)
+  response.headers.update(headers)
+  return None
+
+def construct_content(model: Type[BaseModel], data: Any, fields: Optional[Sequence[str]] = None) -> Any:
+  """Shape a document, or a list of them, like model without validating
+
+  model_construct keeps only the model's fields and fills defaults. With fields, only
+  those keys are kept (sparse fieldsets).
+  """
+  def construct(item: Any) -> Any:
+    constructed = model.model_construct(**item).__dict__
+    return {name: constructed.get(name) for name in fields} if fields else constructed
+
+  return [construct(item) for item in data] if isinstance(data, list) else construct(data)
+
+def trusted_response(model: Type[BaseModel], data: Any, response: Response, fields: Optional[Sequence[str]] = None) -> Response:
+  """Serialize DB-sourced data in the shape of model without validating it
+
+  The data is shaped with construct_content, then orjson encodes the result. BSON
+  values orjson doesn't know, like ObjectId, are stringified by the encoder, so
+  services can hand over documents as Mongo returned them. Headers already set on the
+  route's response (like ETag) are carried over. Returning a Response also skips
+  FastAPI's response_model validation, which still documents the route.
+  """
+  return Response(
+    content=orjson.dumps(construct_content(model, data, fields), default=str),
+    media_type="application/json",
+    headers=dict(response.headers)
+  )
+
+def json_response(
+  request: Request,
+  response: Response,
+  model: Type[BaseModel],
+  data: Any,
+  route_name: str,
+  fields: Optional[Sequence[str]] = None
+) -> Response:
+  """trusted_response with validators, answering 304 when the client copy is current
+
+  The ETag is hashed from the encoded body, so it always matches what is sent and
+  costs a sha256 over bytes that are produced anyway.
+  """
+  content = orjson.dumps(construct_content(model, data, fields), default=str)
+  not_modified = conditional_response(request, response, etag_for_content(content), route_name)
+  if not_modified:
+    return not_modified
+  return Response(content=content, media_type="application/json", headers=dict(response.headers))
+
+class ImmutableStaticFiles(StaticFiles):
+  """StaticFiles that lets clients keep assets for STATIC_CACHE_CONTROL"""
+
+  def file_response(self, *args, **kwargs) -> Response:
+    response = super().file_response(*args, **kwargs)
+    response.headers["Cache-Control"] = STATIC_CACHE_CONTROL
+    return response
+
+class StaleResponseMiddleware:
+  """Mark successful responses built from last-known-good data after a MongoDB failure
+
+  X-Stale-Age carries the age in seconds of the oldest stale result used, and
+  Cache-Control is set to no-store so clients don't hold on to it.
+  """
+
+  def __init__(self, app: ASGIApp):
+    self.app = app
+
+  async def __call__(self, scope: Scope, receive: Receive, send: Send):
+    if scope["type"] != "http":
+      await self.app(scope, receive, send)
+      return
+
+    ages = []
+    token = stale_age.set(ages)
+
+    async def send_marked(message: Message):
+      # Errors aren't marked: a stale read may have happened before the request failed anyway
+      if message["type"] == "http.response.start" and ages and 200 <= message["status"] < 300:
+        headers = MutableHeaders(scope=message)
+        headers["X-Stale-Age"] = str(int(max(ages)))
+        headers["Cache-Control"] = "no-store"
+      await send(message)
+
+    try:
+      await self.app(scope, receive, send_marked)
+    finally:
+      stale_age.reset(token)
@@ -0,0 +1,62 @@
+from typing import Any, Dict, List, Optional
+from pymongo import IndexModel
+from pymongo.errors import PyMongoError
+import util.db
+
+# Indexes each service needs for its query paths, by collection
+_indexes: Dict[str, List[IndexModel]] = {}
+
+# Representative queries per collection, explained to catch collection scans
+_queries: Dict[str, List[Dict[str, Any]]] = {}
+
+def declare_indexes(collection_name: str, *indexes: IndexModel):
+  """Register indexes for a collection; services call this at import time"""
+  _indexes.setdefault(collection_name, []).extend(indexes)
+
+def declare_query(collection_name: str, filter: Dict, sort: Optional[List] = None):
+  """Register a query shape a service runs, for find_collection_scans"""
+  _queries.setdefault(collection_name, []).append({"filter": filter, "sort": sort})
+
+async def ensure_indexes() -> Dict[str, List[str]]:
+  """Create every declared index (a no-op for ones that already exist)
+
+  Returns the index names per collection. Failures, such as a database user without
+  createIndex permission, are reported under "errors" rather than raised.
+  """
+  created: Dict[str, List[str]] = {}
+  errors = []
+  for collection_name, indexes in _indexes.items():
+    try:
+      created[collection_name] = await util.db.get_collection(collection_name).create_indexes(indexes)
+    except PyMongoError as e:
+      errors.append(f"{collection_name}: {str(e)}")
+      print(f"MongoDB error ensuring indexes on {collection_name}: {str(e)}")
+  if errors:
+    created["errors"] = errors
+  return created
+
+def plan_stages(plan: Any) -> List[str]:
+  """Every stage name in an explain plan tree"""
+  if isinstance(plan, list):
+    return [stage for item in plan for stage in plan_stages(item)]
+  if not isinstance(plan, dict):
+    return []
+  stages = [plan["stage"]] if "stage" in plan else []
+  for value in plan.values():
+    if isinstance(value, (dict, list)):
+      stages.extend(plan_stages(value))
+  return stages
+
+async def find_collection_scans() -> List[Dict]:
+  """Explain each declared query and return the ones whose winning plan scans the collection"""
+  scans = []
+  for collection_name, queries in _queries.items():
+    collection = util.db.get_collection(collection_name)
+    for query in queries:
+      cursor = collection.find(query["filter"])
+      if query["sort"]:
+        cursor = cursor.sort(query["sort"])
+      explanation = await cursor.explain()
+      if "COLLSCAN" in plan_stages(explanation.get("queryPlanner", {}).get("winningPlan", {})):
+        scans.append({"collection": collection_name, **query})
+  return scans
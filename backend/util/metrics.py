@@ -0,0 +1,180 @@
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+import time
+from pymongo import monitoring
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Upper bounds in seconds, from a cache hit to a slow GitHub GraphQL call
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+def escape_label_value(value: str) -> str:
+  return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+  pairs = list(labels) + ([extra] if extra else [])
+  if not pairs:
+    return ""
+  return "{" + ",".join(f'{name}="{escape_label_value(str(value))}"' for name, value in pairs) + "}"
+
+def format_value(value: float) -> str:
+  return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+class Counter:
+  def __init__(self, name: str, help_text: str):
+    self.name = name
+    self.help_text = help_text
+    self.values: Dict[Labels, float] = defaultdict(float)
+
+  def inc(self, amount: float = 1.0, **labels: str):
+    self.values[tuple(sorted(labels.items()))] += amount
+
+  def render(self) -> List[str]:
+    lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+    for labels, value in sorted(self.values.items()):
+      lines.append(f"{self.name}{format_labels(labels)} {format_value(value)}")
+    return lines
+
+class Gauge:
+  def __init__(self, name: str, help_text: str):
+    self.name = name
+    self.help_text = help_text
+    self.values: Dict[Labels, float] = {}
+
+  def set(self, value: float, **labels: str):
+    self.values[tuple(sorted(labels.items()))] = value
+
+  def render(self) -> List[str]:
+    lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge"]
+    for labels, value in sorted(self.values.items()):
+      lines.append(f"{self.name}{format_labels(labels)} {format_value(value)}")
+    return lines
+
+class Histogram:
+  def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+    self.name = name
+    self.help_text = help_text
+    self.buckets = buckets
+    # Per label set: non-cumulative bucket counts (last slot is +Inf), sum and count
+    self.series: Dict[Labels, List] = {}
+
+  def observe(self, value: float, **labels: str):
+    key = tuple(sorted(labels.items()))
+    series = self.series.get(key)
+    if series is None:
+      series = self.series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+    series[0][bisect_left(self.buckets, value)] += 1
+    series[1] += value
+    series[2] += 1
+
+  def render(self) -> List[str]:
+    lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+    for labels, (counts, total, count) in sorted(self.series.items()):
+      cumulative = 0
+      for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+        cumulative += bucket_count
+        le = "+Inf" if bound == float("inf") else format_value(bound)
+        lines.append(f"{self.name}_bucket{format_labels(labels, ('le', le))} {cumulative}")
+      lines.append(f"{self.name}_sum{format_labels(labels)} {format_value(round(total, 6))}")
+      lines.append(f"{self.name}_count{format_labels(labels)} {count}")
+    return lines
+
+http_request_duration = Histogram("http_request_duration_seconds", "Time to serve a request, by route template")
+http_requests = Counter("http_requests_total", "Requests served, by route template and status code")
+mongodb_command_duration = Histogram("mongodb_command_duration_seconds", "MongoDB command round trips, by collection")
+mongodb_command_errors = Counter("mongodb_command_errors_total", "Failed MongoDB commands, by collection")
+github_request_duration = Histogram("github_graphql_request_duration_seconds", "GitHub GraphQL call latency, by operation")
+github_request_errors = Counter("github_graphql_errors_total", "GitHub GraphQL calls that failed, by operation")
+github_rate_limit_remaining = Gauge("github_graphql_rate_limit_remaining", "Points left in the GitHub GraphQL rate limit window")
+
+def observe_github_request(operation: str, seconds: float, headers: Optional[Dict] = None, failed: bool = False):
+  github_request_duration.observe(seconds, operation=operation)
+  if failed:
+    github_request_errors.inc(operation=operation)
+  remaining = headers.get("x-ratelimit-remaining") if headers is not None else None
+  if remaining is not None and remaining.isdigit():
+    github_rate_limit_remaining.set(int(remaining))
+
+class MongoCommandMetrics(monitoring.CommandListener):
+  """Record each MongoDB command's duration and failures against its collection"""
+
+  def __init__(self):
+    self._collections: Dict[Tuple, str] = {}
+
+  def started(self, event: monitoring.CommandStartedEvent):
+    target = event.command.get(event.command_name)
+    # getMore names the collection separately, and admin commands have none
+    collection = target if isinstance(target, str) else event.command.get("collection", "none")
+    self._collections[(event.connection_id, event.request_id)] = str(collection)
+
+  def finish(self, event, failed: bool):
+    collection = self._collections.pop((event.connection_id, event.request_id), "none")
+    mongodb_command_duration.observe(event.duration_micros / 1_000_000, collection=collection, command=event.command_name)
+    if failed:
+      mongodb_command_errors.inc(collection=collection, command=event.command_name)
+
+  def succeeded(self, event: monitoring.CommandSucceededEvent):
+    self.finish(event, failed=False)
+
+  def failed(self, event: monitoring.CommandFailedEvent):
+    self.finish(event, failed=True)
+
+class MetricsMiddleware:
+  """Time every HTTP request and count responses by route template and status
+
+  Routes are labelled by their template (/github-stats/ingest/{job_id}), not the
+  raw path, so the number of series stays bounded.
+  """
+
+  def __init__(self, app: ASGIApp):
+    self.app = app
+
+  async def __call__(self, scope: Scope, receive: Receive, send: Send):
+    if scope["type"] != "http":
+      await self.app(scope, receive, send)
+      return
+
+    started = time.perf_counter()
+    status_code = 500
+
+    async def send_with_status(message: Message):
+      nonlocal status_code
+      if message["type"] == "http.response.start":
+        status_code = message["status"]
+      await send(message)
+
+    try:
+      await self.app(scope, receive, send_with_status)
+    finally:
+      route = getattr(scope.get("route"), "path", None) or "unmatched"
+      http_request_duration.observe(time.perf_counter() - started, method=scope["method"], route=route)
+      http_requests.inc(method=scope["method"], route=route, status=str(status_code))
+
+def render_metrics(cache_stats: Dict[str, Dict]) -> str:
+  """Prometheus text exposition of every metric, plus the given cache stats"""
+  cache_lookups = Counter("cache_lookups_total", "In-memory cache lookups, by cache and result")
+  cache_hit_ratio = Gauge("cache_hit_ratio", "Share of in-memory cache lookups that were hits")
+  cache_entries = Gauge("cache_entries", "Entries currently held in each in-memory cache")
+  for cache, stats in cache_stats.items():
+    cache_lookups.inc(stats["hits"], cache=cache, result="hit")
+    cache_lookups.inc(stats["misses"], cache=cache, result="miss")
+    cache_hit_ratio.set(stats["hitRatio"], cache=cache)
+    cache_entries.set(stats["entries"], cache=cache)
+
+  lines = []
+  for metric in (
+    http_request_duration,
+    http_requests,
+    mongodb_command_duration,
+    mongodb_command_errors,
+    github_request_duration,
+    github_request_errors,
+    github_rate_limit_remaining,
+    cache_lookups,
+    cache_hit_ratio,
+    cache_entries,
+  ):
+    lines.extend(metric.render())
+  return "\n".join(lines) + "\n"
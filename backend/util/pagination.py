@@ -0,0 +1,64 @@
+from fastapi import HTTPException, Response, status
+from pydantic import BaseModel
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+import base64
+import orjson
+
+MAX_PAGE_SIZE = 100
+
+def encode_cursor(values: List[Any]) -> str:
+  """Opaque cursor holding the sort key values of the last item on a page"""
+  return base64.urlsafe_b64encode(orjson.dumps(values, default=str)).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> List[Any]:
+  """Sort key values from a cursor, raising ValueError if it was not issued by encode_cursor"""
+  try:
+    values = orjson.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+  except (ValueError, TypeError):
+    raise ValueError("Invalid cursor")
+  if not isinstance(values, list):
+    raise ValueError("Invalid cursor")
+  return values
+
+def parse_fields(model: Type[BaseModel], fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+  """Validate a comma-separated fields parameter against the model's fields"""
+  if not fields:
+    return None
+  names = tuple(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+  unknown = [name for name in names if name not in model.model_fields]
+  if unknown or not names:
+    raise HTTPException(
+      status_code=status.HTTP_400_BAD_REQUEST,
+      detail=f"Unknown fields: {', '.join(unknown) or fields}. Available: {', '.join(model.model_fields)}"
+    )
+  return names
+
+def build_projection(fields: Optional[Tuple[str, ...]], required: Tuple[str, ...] = ()) -> Optional[Dict[str, int]]:
+  """Mongo projection for the requested fields plus any the query needs (like sort keys)
+
+  Without fields the whole document is read, minus _id unless it is required.
+  """
+  if not fields:
+    return None if "_id" in required else {"_id": 0}
+  projection = {name: 1 for name in fields + required}
+  if "_id" not in required:
+    projection["_id"] = 0
+  return projection
+
+def split_page(
+  docs: List[Dict],
+  limit: Optional[int],
+  cursor_values: Callable[[Dict], List[Any]],
+  response: Response
+) -> List[Dict]:
+  """Trim the extra document a service fetched past limit, and advertise the next page
+
+  Services read limit + 1 documents so a following page can be detected without a
+  count. The cursor for it is sent in the X-Next-Cursor header, which keeps the body
+  a plain list.
+  """
+  if not limit or len(docs) <= limit:
+    return docs
+  page = docs[:limit]
+  response.headers["X-Next-Cursor"] = encode_cursor(cursor_values(page[-1]))
+  return page
@@ -0,0 +1,110 @@
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional
+import asyncio
+import cProfile
+import hmac
+import io
+import os
+import pstats
+import time
+import uuid
+from dotenv import load_dotenv
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+load_dotenv()
+
+# Profiling is off unless a secret is configured; requests opt in with X-Profile-Secret
+PROFILING_SECRET = os.getenv("PROFILING_SECRET")
+PROFILE_HEADER = "X-Profile-Secret"
+# Reports kept in memory, and functions listed in each
+MAX_PROFILE_REPORTS = int(os.getenv("PROFILE_MAX_REPORTS", "20"))
+PROFILE_TOP_FUNCTIONS = int(os.getenv("PROFILE_TOP_FUNCTIONS", "40"))
+
+_reports: "OrderedDict[str, Dict]" = OrderedDict()
+
+# Only one cProfile can run per thread at a time
+_profile_lock = asyncio.Lock()
+
+def profiling_authorized(secret: Optional[str]) -> bool:
+  """True when profiling is configured and the given header value matches its secret"""
+  return bool(PROFILING_SECRET and secret and hmac.compare_digest(secret.encode(), PROFILING_SECRET.encode()))
+
+def format_profile(profile: cProfile.Profile) -> str:
+  output = io.StringIO()
+  stats = pstats.Stats(profile, stream=output)
+  stats.strip_dirs().sort_stats("cumulative").print_stats(PROFILE_TOP_FUNCTIONS)
+  return output.getvalue()
+
+def store_report(report_id: str, label: str, profile: cProfile.Profile, duration_ms: float):
+  _reports[report_id] = {
+    "profileId": report_id,
+    "label": label,
+    "createdAt": datetime.utcnow().isoformat() + "Z",
+    "durationMs": round(duration_ms, 1),
+    "report": format_profile(profile),
+  }
+  while len(_reports) > MAX_PROFILE_REPORTS:
+    _reports.popitem(last=False)
+
+def get_report(report_id: str) -> Optional[Dict]:
+  return _reports.get(report_id)
+
+def list_reports() -> List[Dict]:
+  return [{key: value for key, value in report.items() if key != "report"} for report in reversed(_reports.values())]
+
+class ProfileSession:
+  """cProfile around a block of async work, stored as a report when it stops
+
+  Sessions run one at a time, so entering waits for any running profile to finish.
+  cProfile follows the event loop thread, so the report also includes whatever else
+  ran concurrently. Profile against a quiet instance for clean numbers.
+  """
+
+  def __init__(self, label: str):
+    self.label = label
+    self.profile = cProfile.Profile()
+    # Known up front, so callers can hand it out before the work finishes
+    self.report_id = uuid.uuid4().hex
+
+  async def __aenter__(self) -> "ProfileSession":
+    await _profile_lock.acquire()
+    self.started = time.perf_counter()
+    self.profile.enable()
+    return self
+
+  async def __aexit__(self, *exc_info):
+    self.profile.disable()
+    _profile_lock.release()
+    store_report(self.report_id, self.label, self.profile, (time.perf_counter() - self.started) * 1000)
+
+class ProfilingMiddleware:
+  """Profile single requests that carry a valid X-Profile-Secret header
+
+  The report id comes back in X-Profile-Id; fetch the report from GET /profiles/{id}.
+  main.py only installs this when PROFILING_SECRET is set, so other deployments pay nothing.
+  """
+
+  def __init__(self, app: ASGIApp):
+    self.app = app
+
+  async def __call__(self, scope: Scope, receive: Receive, send: Send):
+    if scope["type"] != "http" or not profiling_authorized(Headers(scope=scope).get(PROFILE_HEADER)):
+      await self.app(scope, receive, send)
+      return
+
+    if _profile_lock.locked() or scope["path"].startswith("/profiles"):
+      # Another profile is running (serve normally rather than queue), or this is a report read
+      await self.app(scope, receive, send)
+      return
+
+    session = ProfileSession(f"{scope['method']} {scope['path']}")
+
+    async def send_with_profile_id(message: Message):
+      if message["type"] == "http.response.start":
+        MutableHeaders(scope=message)["X-Profile-Id"] = session.report_id
+      await send(message)
+
+    async with session:
+      await self.app(scope, receive, send_with_profile_id)
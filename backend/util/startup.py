@@ -0,0 +1,75 @@
+from typing import Awaitable, Callable, Dict, List
+import asyncio
+import os
+import time
+import util.db
+import util.indexes
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Seconds from importing main.py to serving requests; slower startup work continues in the background
+STARTUP_BUDGET_SECONDS = float(os.getenv("STARTUP_BUDGET_SECONDS", "5"))
+# Fill the service cache for the read endpoints during startup
+CACHE_PREWARM = os.getenv("CACHE_PREWARM", "false").lower() == "true"
+# Create the indexes services declare, then explain their queries and report collection scans
+ENSURE_INDEXES = os.getenv("ENSURE_INDEXES", "true").lower() == "true"
+INDEX_SCAN_CHECK = os.getenv("INDEX_SCAN_CHECK", "false").lower() == "true"
+
+startup_report: Dict = {"status": "starting"}
+
+# Keeps startup work that outlives the budget from being garbage collected
+_background_tasks = set()
+
+async def run_startup(process_started: float, warmups: List[Callable[[], Awaitable]]):
+  """Connect to MongoDB, ensure indexes and run the cache warmups within STARTUP_BUDGET_SECONDS
+
+  process_started is the perf_counter reading taken when main.py began importing, so
+  the budget covers imports too. Work still running when the budget is spent carries
+  on in the background: a slow cluster delays /ready, not the process serving /health.
+  """
+  started = time.perf_counter()
+  import_ms = (started - process_started) * 1000
+  startup_report.update({
+    "status": "starting",
+    "budgetMs": STARTUP_BUDGET_SECONDS * 1000,
+    "importMs": round(import_ms, 1),
+    "warmups": len(warmups),
+  })
+
+  async def connect_and_warm():
+    try:
+      await util.db.connect()
+      if ENSURE_INDEXES:
+        startup_report["indexes"] = await util.indexes.ensure_indexes()
+      if INDEX_SCAN_CHECK:
+        scans = await util.indexes.find_collection_scans()
+        for scan in scans:
+          print(f"Collection scan on {scan['collection']}: filter={scan['filter']} sort={scan['sort']}")
+        startup_report["collectionScans"] = scans
+      results = await asyncio.gather(*(warmup() for warmup in warmups), return_exceptions=True)
+      failed = [str(result) for result in results if isinstance(result, Exception)]
+      startup_report.update({"status": "completed", "warmupErrors": failed})
+    except Exception as e:
+      print(f"Startup error: {str(e)}")
+      startup_report.update({"status": "failed", "error": str(e)})
+    startup_report["completedMs"] = round((time.perf_counter() - process_started) * 1000, 1)
+
+  task = asyncio.create_task(connect_and_warm())
+  remaining = max(0.0, STARTUP_BUDGET_SECONDS - import_ms / 1000)
+  done, _ = await asyncio.wait({task}, timeout=remaining)
+  if not done:
+    startup_report["status"] = "running in background"
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+  total_ms = (time.perf_counter() - process_started) * 1000
+  startup_report.update({
+    "startupMs": round(total_ms, 1),
+    "withinBudget": bool(done) and total_ms <= STARTUP_BUDGET_SECONDS * 1000,
+  })
+  print(f"Startup took {total_ms:.0f}ms (budget {STARTUP_BUDGET_SECONDS * 1000:.0f}ms): {startup_report['status']}")
+
+async def cancel_startup():
+  for task in list(_background_tasks):
+    task.cancel()